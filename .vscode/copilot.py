@@ -11,6 +11,7 @@ Utilitaires pour la gestion des données candidats.
 from pathlib import Path
 from typing import List, Dict
 import json
+import os
 import re
 import csv
 
@@ -22,8 +23,8 @@ RAW_DIR = DATA_DIR / "Raw"
 PROCESSED_DIR = DATA_DIR / "Processed"
 PARSED_DIR = PROCESSED_DIR / "parsed"
 
-# On crée les dossiers si besoin
-PARSED_DIR.mkdir(parents=True, exist_ok=True)
+# On crée les dossiers si besoin (os.makedirs : une seule passe, pas d'objet Path intermédiaire)
+os.makedirs(PARSED_DIR, exist_ok=True)
 
 
 def list_raw_files(extensions: tuple = (".txt", ".pdf")) -> List[Path]:
@@ -137,8 +138,9 @@ def save_candidates_csv(candidates: List[Dict]) -> Path:
     with csv_path.open("w", newline="", encoding="utf-8") as f:
         writer = csv.DictWriter(f, fieldnames=fieldnames)
         writer.writeheader()
-        for cand in candidates:
-            writer.writerow({k: cand[k] for k in fieldnames})
+        # Une seule passe writerows : le tampon est vidé en bloc plutôt
+        # qu'au fil des writerow individuels
+        writer.writerows({k: cand[k] for k in fieldnames} for cand in candidates)
 
     return csv_path
 
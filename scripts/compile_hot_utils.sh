@@ -0,0 +1,27 @@
+#!/usr/bin/env bash
+# Compile les modules utils chauds en extensions C via mypyc.
+#
+# parsing.py, preprocessing.py et scoring.py sont purement interprétés :
+# opérations sur sets, chaînes et petites boucles, le profil où mypyc
+# apporte typiquement 2-5× sans réécriture (les fonctions sont déjà
+# annotées). mypyc dépose les .so à côté des .py, que l'import Python
+# préfère automatiquement — aucun autre changement n'est nécessaire.
+#
+# Usage (depuis la racine du projet) :
+#     ./scripts/compile_hot_utils.sh
+#
+# Pour revenir aux .py interprétés :
+#     find src/utils -name '*.so' -delete
+set -euo pipefail
+
+cd "$(dirname "$0")/.."
+
+if ! python -c "import mypyc" >/dev/null 2>&1; then
+    echo "mypyc introuvable : pip install mypy (mypyc est fourni avec)" >&2
+    exit 1
+fi
+
+exec python -m mypyc \
+    src/utils/scoring.py \
+    src/utils/preprocessing.py \
+    src/utils/parsing.py
@@ -0,0 +1,21 @@
+#!/usr/bin/env bash
+# Lance le prétraitement (CV + offres) sous PyPy.
+#
+# Le pipeline de prétraitement est dominé par du parsing de chaînes, des
+# scans regex et de la construction de dicts : exactement le profil que le
+# JIT de PyPy accélère le mieux (3-10× observés sur ce type de charge).
+# Le chemin d'import de src.app.preprocess_data ne charge ni numpy ni
+# aucune extension C hostile à PyPy — seuls re/json/pathlib sont utilisés.
+#
+# Usage (depuis la racine du projet) :
+#     ./scripts/preprocess_pypy.sh
+set -euo pipefail
+
+cd "$(dirname "$0")/.."
+
+if ! command -v pypy3 >/dev/null 2>&1; then
+    echo "pypy3 introuvable : installez PyPy ou utilisez 'python -m src.app.preprocess_data'" >&2
+    exit 1
+fi
+
+exec pypy3 -m src.app.preprocess_data "$@"
@@ -1,7 +1,67 @@
 """AgentDécideur : décision finale avec pondération multi-critères."""
+import bisect
+import heapq
+from dataclasses import asdict, dataclass
 from typing import Any, Dict, List, Optional, Tuple
 
+import numpy as np
+
 from src.config import WEIGHT_PROFIL, WEIGHT_TECHNIQUE, WEIGHT_SOFTSKILLS
+from src.utils.scoring_numba import weighted_global_scores
+
+
+@dataclass(slots=True)
+class DecisionResult:
+    """Résultat de décision pour un candidat.
+
+    Structure à __slots__ : nettement plus compacte qu'un dict par
+    candidat sur les gros lots, avec accès attribut plus rapide.
+    """
+    candidate_id: str
+    score_global: float
+    score_profil: float
+    score_technique: float
+    score_softskills: float
+    recommandation: str
+    justification: str
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Conversion en dict pour la sérialisation (JSON, UI)."""
+        return asdict(self)
+
+
+class CandidateBatch:
+    """
+    Vue Structure-of-Arrays d'un lot de décisions.
+
+    Les champs chauds (scores, ids, recommandations) sont stockés en
+    colonnes NumPy contiguës : tri et statistiques travaillent sur des
+    buffers compacts au lieu de déréférencer un objet par candidat.
+    """
+
+    __slots__ = ("evaluations", "ids", "scores", "recommandations")
+
+    def __init__(self, evaluations: List[DecisionResult]):
+        self.evaluations = list(evaluations)
+        n = len(self.evaluations)
+        self.ids = np.array([e.candidate_id for e in self.evaluations], dtype=object)
+        self.scores = np.fromiter(
+            (e.score_global for e in self.evaluations),
+            dtype=np.float32,
+            count=n
+        )
+        self.recommandations = np.array(
+            [e.recommandation for e in self.evaluations], dtype=object
+        )
+
+    def ordre_decroissant(self) -> np.ndarray:
+        """Indices des candidats par score global décroissant (tri stable)."""
+        return np.argsort(-self.scores, kind="stable")
+
+# Seuils de classification et labels associés (partagés entre le chemin
+# unitaire et le chemin vectorisé)
+_SEUILS = (40.0, 60.0, 80.0)
+_LABELS = ("à rejeter", "à considérer", "recommandé", "fortement recommandé")
 
 
 class AgentDecideur:
@@ -35,7 +95,7 @@ class AgentDecideur:
         commentaire_softskills: str = "",
         profil_structuré: Optional[Dict] = None,
         job_profile: Optional[Dict] = None
-    ) -> Dict[str, Any]:
+    ) -> DecisionResult:
         """
         Prend une décision finale pour un candidat.
         
@@ -51,7 +111,7 @@ class AgentDecideur:
             job_profile: Profil de l'offre
         
         Returns:
-            Dict avec:
+            DecisionResult avec notamment:
             - score_global: score agrégé (0-100)
             - recommandation: "fortement recommandé" / "recommandé" / "à rejeter"
             - justification: texte explicatif complet
@@ -81,26 +141,50 @@ class AgentDecideur:
             job_profile
         )
         
+        return DecisionResult(
+            candidate_id=candidate_id,
+            score_global=score_global,
+            score_profil=score_profil,
+            score_technique=score_technique,
+            score_softskills=score_softskills,
+            recommandation=recommandation,
+            justification=justification
+        )
+    
+    def prendre_decision_batch(self, scores: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Version vectorisée de la décision pour un lot de candidats.
+
+        Args:
+            scores: Array (N, 3) avec les colonnes (profil, technique, softskills)
+
+        Returns:
+            Dict avec:
+            - scores_globaux: array (N,) des scores agrégés (0-100)
+            - recommandations: array (N,) des labels de classification
+        """
+        scores = np.asarray(scores, dtype=np.float32)
+        poids = np.array(
+            [self.weight_profil, self.weight_technique, self.weight_softskills],
+            dtype=np.float32
+        )
+        # Noyau JIT si Numba est disponible, produit matriciel NumPy sinon
+        scores_globaux = weighted_global_scores(scores, poids)
+
+        # Classification sans branche : searchsorted sur les seuils puis
+        # indexation dans le tableau de labels
+        indices = np.searchsorted(_SEUILS, scores_globaux, side="right")
+        recommandations = np.asarray(_LABELS, dtype=object)[indices]
+
         return {
-            "candidate_id": candidate_id,
-            "score_global": score_global,
-            "score_profil": score_profil,
-            "score_technique": score_technique,
-            "score_softskills": score_softskills,
-            "recommandation": recommandation,
-            "justification": justification
+            "scores_globaux": scores_globaux,
+            "recommandations": recommandations
         }
-    
+
     def _classifier(self, score_global: float) -> str:
         """Classifie le candidat selon son score global."""
-        if score_global >= 80:
-            return "fortement recommandé"
-        elif score_global >= 60:
-            return "recommandé"
-        elif score_global >= 40:
-            return "à considérer"
-        else:
-            return "à rejeter"
+        # Même table seuils/labels que le chemin vectorisé
+        return _LABELS[bisect.bisect_right(_SEUILS, score_global)]
     
     def _generer_justification(
         self,
@@ -117,15 +201,37 @@ class AgentDecideur:
         job_profile: Optional[Dict]
     ) -> str:
         """Génère une justification complète."""
-        
+
+        # La justification basique est construite une seule fois : elle sert
+        # de résultat direct sans LLM, et de repli précalculé si le LLM échoue
+        basique = self._generer_justification_basique(
+            candidate_id, score_global, score_profil, score_technique, score_softskills,
+            commentaire_profil, commentaire_technique, commentaire_softskills,
+            recommandation
+        )
+
         if self.llm:
             return self._generer_justification_llm(
                 candidate_id, score_global, score_profil, score_technique, score_softskills,
                 commentaire_profil, commentaire_technique, commentaire_softskills,
-                recommandation, profil_structuré, job_profile
+                recommandation, fallback=basique
             )
-        
-        # Justification basique sans LLM
+
+        return basique
+
+    def _generer_justification_basique(
+        self,
+        candidate_id: str,
+        score_global: float,
+        score_profil: float,
+        score_technique: float,
+        score_softskills: float,
+        commentaire_profil: str,
+        commentaire_technique: str,
+        commentaire_softskills: str,
+        recommandation: str
+    ) -> str:
+        """Justification basique sans LLM."""
         justification_parts = [
             f"Candidat: {candidate_id}",
             f"Score global: {score_global:.1f}/100",
@@ -159,10 +265,9 @@ class AgentDecideur:
         commentaire_technique: str,
         commentaire_softskills: str,
         recommandation: str,
-        profil_structuré: Optional[Dict],
-        job_profile: Optional[Dict]
+        fallback: str = ""
     ) -> str:
-        """Génère une justification avec LLM."""
+        """Génère une justification avec LLM (repli précalculé si échec)."""
         prompt = f"""
 Tu es un agent décideur RH expert. Génère un rapport de décision complet et justifié
 pour le candidat {candidate_id}.
@@ -187,43 +292,102 @@ et professionnelle.
             response = self.llm(prompt)
             return response if isinstance(response, str) else str(response)
         except Exception:
-            return self._generer_justification(
-                candidate_id, score_global, score_profil, score_technique, score_softskills,
-                commentaire_profil, commentaire_technique, commentaire_softskills,
-                recommandation, profil_structuré, job_profile
-            )  # Fallback
-    
+            return fallback  # Déjà construit, aucun reformatage en cas d'échec
+
     def classer_candidats(
         self,
-        evaluations: List[Dict[str, Any]]
-    ) -> List[Dict[str, Any]]:
+        evaluations: List[DecisionResult],
+        top_k: Optional[int] = None
+    ) -> List[DecisionResult]:
         """
         Classe une liste de candidats par score global décroissant.
-        
+
         Args:
-            evaluations: Liste de dicts avec les clés de prendre_decision
-        
+            evaluations: Liste de DecisionResult issus de prendre_decision
+            top_k: Si fourni, ne retourne que les top_k meilleurs via un
+                tri partiel O(N + k log k) (argpartition) au lieu du tri
+                complet O(N log N)
+
+        Returns:
+            Liste triée par score_global décroissant (tronquée à top_k)
+        """
+        # Tri sur la colonne de scores contiguë plutôt que par comparaison
+        # d'objets Python
+        batch = CandidateBatch(evaluations)
+        if top_k is not None and 0 < top_k < batch.scores.size:
+            idx = np.argpartition(-batch.scores, top_k)[:top_k]
+            order = idx[np.argsort(-batch.scores[idx], kind="stable")]
+        else:
+            order = batch.ordre_decroissant()
+        return [batch.evaluations[i] for i in order]
+
+    def classer_top_n(
+        self,
+        evaluations: List[DecisionResult],
+        n: int = 5
+    ) -> List[DecisionResult]:
+        """
+        Retourne les n meilleurs candidats par score global décroissant.
+
+        Tri partiel en O(N log n) via heapq.nlargest, à préférer à
+        classer_candidats quand seul le top N est consommé.
+        """
+        return heapq.nlargest(n, evaluations, key=lambda x: x.score_global)
+
+    def rank_and_summarize(
+        self,
+        evaluations: List[DecisionResult],
+        top_k: int = 5
+    ) -> Tuple[List[DecisionResult], Dict[str, Any]]:
+        """
+        Top-k et statistiques en un seul passage sur les scores.
+
+        La colonne de scores n'est matérialisée qu'une fois (fromiter) et
+        sert à la fois au tri partiel (argpartition) et aux réductions
+        moyenne/max/min — là où classer_top_n + un second passage stats la
+        reconstruiraient deux fois.
+
         Returns:
-            Liste triée par score_global décroissant
+            Tuple (top_candidats, statistiques) où statistiques a les clés
+            total_candidats, score_moyen, score_max, score_min.
         """
-        return sorted(
-            evaluations,
-            key=lambda x: x.get("score_global", 0),
-            reverse=True
+        n = len(evaluations)
+        if n == 0:
+            return [], {
+                "total_candidats": 0,
+                "score_moyen": 0,
+                "score_max": 0,
+                "score_min": 0
+            }
+
+        scores = np.fromiter(
+            (e.score_global for e in evaluations), dtype=np.float32, count=n
         )
-    
+        k = min(top_k, n)
+        idx = np.argpartition(-scores, k)[:k] if k < n else np.arange(n)
+        order = idx[np.argsort(-scores[idx], kind="stable")]
+        top_candidats = [evaluations[i] for i in order]
+
+        statistiques = {
+            "total_candidats": n,
+            "score_moyen": float(scores.mean()),
+            "score_max": float(scores.max()),
+            "score_min": float(scores.min())
+        }
+        return top_candidats, statistiques
+
     def generer_rapport_final(
         self,
-        evaluations_classees: List[Dict[str, Any]],
+        evaluations_classees: List[DecisionResult],
         job_profile: Optional[Dict] = None
     ) -> Dict[str, Any]:
         """
         Génère un rapport final avec le top N candidats.
-        
+
         Args:
             evaluations_classees: Liste de candidats classés
             job_profile: Profil de l'offre
-        
+
         Returns:
             Dict avec:
             - top_candidats: top 3 ou 5
@@ -231,35 +395,37 @@ et professionnelle.
             - statistiques: stats sur les candidats
         """
         top_n = min(5, len(evaluations_classees))
-        top_candidats = evaluations_classees[:top_n]
-        
-        # Statistiques
-        scores_globaux = [e.get("score_global", 0) for e in evaluations_classees]
-        moyenne = sum(scores_globaux) / len(scores_globaux) if scores_globaux else 0
-        max_score = max(scores_globaux) if scores_globaux else 0
-        min_score = min(scores_globaux) if scores_globaux else 0
-        
-        resume = f"""
+        # Un seul passage sur les scores pour le top N et les statistiques
+        top_candidats, statistiques = self.rank_and_summarize(
+            evaluations_classees, top_n
+        )
+        moyenne = statistiques["score_moyen"]
+        max_score = statistiques["score_max"]
+        min_score = statistiques["score_min"]
+
+        # Accumulation en liste puis join unique (évite les réallocations
+        # de la concaténation str += en boucle)
+        resume_parts = [f"""
 Rapport de sélection - {len(evaluations_classees)} candidat(s) évalué(s)
 
 Top {top_n} candidats:
-"""
+"""]
         for i, cand in enumerate(top_candidats, 1):
-            resume += f"\n{i}. {cand.get('candidate_id', 'N/A')} - Score: {cand.get('score_global', 0):.1f}/100"
-            resume += f" ({cand.get('recommandation', 'N/A')})"
-        
-        resume += f"\n\nStatistiques:"
-        resume += f"\n- Score moyen: {moyenne:.1f}/100"
-        resume += f"\n- Score max: {max_score:.1f}/100"
-        resume += f"\n- Score min: {min_score:.1f}/100"
+            candidate_id = cand.candidate_id
+            score_global = cand.score_global
+            recommandation = cand.recommandation
+            resume_parts.append(
+                f"\n{i}. {candidate_id} - Score: {score_global:.1f}/100 ({recommandation})"
+            )
+
+        resume_parts.append("\n\nStatistiques:")
+        resume_parts.append(f"\n- Score moyen: {moyenne:.1f}/100")
+        resume_parts.append(f"\n- Score max: {max_score:.1f}/100")
+        resume_parts.append(f"\n- Score min: {min_score:.1f}/100")
+        resume = "".join(resume_parts)
         
         return {
             "top_candidats": top_candidats,
             "resume": resume,
-            "statistiques": {
-                "total_candidats": len(evaluations_classees),
-                "score_moyen": moyenne,
-                "score_max": max_score,
-                "score_min": min_score
-            }
+            "statistiques": statistiques
         }
@@ -1,11 +1,50 @@
 """AgentProfil : évalue l'adéquation du profil du candidat."""
 import json
+from functools import lru_cache
 from typing import Any, Dict, List, Optional
 import re
 
-from src.utils.parsing import parse_cv_text
-from src.utils.preprocessing import extract_years_of_experience, extract_education_level
-from src.utils.scoring import calculate_profile_score
+# Les imports src.utils.* (parsing, preprocessing, scoring) sont faits
+# paresseusement dans les méthodes : un process qui n'instancie que les
+# autres agents (ex. vue classement de l'app Streamlit) ne paie pas leur
+# coût de chargement
+
+# Patterns précompilés une fois au chargement du module
+_YEAR_RE = re.compile(r'(?:19|20)\d{2}')
+_PHONE_RE = re.compile(r'\d{10}')
+
+# Alternation unique : une seule passe C par ligne au lieu d'un test
+# de sous-chaîne par type de diplôme
+_DIPLOMA_RE = re.compile(r'master|licence|bachelor|doctorat|phd|bts|dut|ingénieur')
+
+
+def _job_prompt_fragment(job_profile: Dict) -> str:
+    """Fragment de prompt décrivant l'offre, calculé une fois par offre.
+
+    Mis en cache sur le dict de l'offre lui-même : sur un lot de N
+    candidats, la partie statique du prompt n'est formatée qu'une fois.
+    """
+    fragment = job_profile.get("_prompt_fragment")
+    if fragment is None:
+        fragment = f"""Profil requis:
+- Poste: {job_profile.get('poste', 'N/A')}
+- Expérience min: {job_profile.get('exp_min', 'N/A')} ans
+- Compétences requises: {', '.join(job_profile.get('skills_obligatoires', [])[:10])}
+
+Génère un commentaire concis (2-3 phrases) expliquant le score.
+"""
+        job_profile["_prompt_fragment"] = fragment
+    return fragment
+
+
+@lru_cache(maxsize=256)
+def _normalize_skills(skills: tuple) -> frozenset:
+    """Normalise un tuple de compétences en frozenset lowercase (mémoïsé).
+
+    Sur un lot de N candidats évalués contre une même offre, les
+    compétences requises ne sont ainsi normalisées qu'une seule fois.
+    """
+    return frozenset(s.lower() for s in skills)
 
 
 class AgentProfil:
@@ -29,27 +68,41 @@ class AgentProfil:
         self,
         cv_text: str,
         lettre_motivation: str = "",
-        job_profile: Optional[Dict] = None
+        job_profile: Optional[Dict] = None,
+        extract_experiences: bool = True,
+        extract_diplomas: bool = True
     ) -> Dict[str, Any]:
         """
         Analyse le profil d'un candidat et retourne une structure enrichie.
-        
+
         Args:
             cv_text: Texte brut du CV
             lettre_motivation: Texte de la lettre de motivation (optionnel)
             job_profile: Profil cible de l'offre (pour scoring)
-        
+            extract_experiences: Structurer les expériences (désactivable
+                pour le chemin d'indexation qui n'en a pas besoin)
+            extract_diplomas: Extraire les diplômes (idem)
+
         Returns:
             Dict avec:
             - profil_structuré: informations extraites
             - score_profil: score de matching (0-100)
             - commentaire: justification textuelle
         """
+        from src.utils.parsing import parse_cv_text
+        from src.utils.scoring import calculate_profile_score
+
         # Parsing du CV
         parsed_cv = parse_cv_text(cv_text)
         
         # Extraction d'informations supplémentaires
-        profil_structuré = self._enrichir_profil(parsed_cv, cv_text, lettre_motivation)
+        profil_structuré = self._enrichir_profil(
+            parsed_cv,
+            cv_text,
+            lettre_motivation,
+            extract_experiences=extract_experiences,
+            extract_diplomas=extract_diplomas
+        )
         
         # Calcul du score si profil cible fourni
         score_profil = 0.0
@@ -65,28 +118,72 @@ class AgentProfil:
             "commentaire": commentaire
         }
     
+    def analyser_profil_batch(
+        self,
+        cv_texts: List[str],
+        lettres: Optional[List[str]] = None,
+        job_profile: Optional[Dict] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Analyse un lot de candidats contre une même offre.
+
+        Pendant profil du chemin batch d'AgentTechnique : le parsing reste
+        par CV (inévitable), mais le travail côté offre — normalisation des
+        compétences requises, fragment de prompt — est mémoïsé et n'est
+        payé qu'une fois pour tout le lot.
+
+        Args:
+            cv_texts: Un texte de CV par candidat
+            lettres: Lettres de motivation alignées sur cv_texts (optionnel)
+            job_profile: Profil cible commun au lot
+
+        Returns:
+            Une liste de résultats au format d'analyser_profil
+        """
+        lettres = lettres or [""] * len(cv_texts)
+        return [
+            self.analyser_profil(cv_text, lettre, job_profile)
+            for cv_text, lettre in zip(cv_texts, lettres)
+        ]
+
     def _enrichir_profil(
         self,
         parsed_cv: Dict,
         cv_text: str,
-        lettre_motivation: str
+        lettre_motivation: str,
+        extract_experiences: bool = True,
+        extract_diplomas: bool = True
     ) -> Dict[str, Any]:
         """Enrichit le profil avec des informations supplémentaires."""
-        
+        from src.utils.preprocessing import extract_years_of_experience, extract_education_level
+
+        # Texte d'éducation lu une seule fois (partagé entre niveau et
+        # diplômes), et minusculisé une seule fois pour les trois
+        # extractions qui en ont besoin
+        education_text = parsed_cv.get("education_text", "")
+        education_lower = education_text.lower()
+
         # Extraction années d'expérience
-        years_exp = extract_years_of_experience(cv_text)
-        
+        years_exp = extract_years_of_experience(cv_text, cv_text.lower())
+
         # Extraction niveau d'éducation
-        education_level = extract_education_level(parsed_cv.get("education_text", ""))
-        
-        # Extraction nom (première ligne souvent)
-        nom = self._extract_name(cv_text)
-        
-        # Extraction diplômes
-        diplomes = self._extract_diplomas(parsed_cv.get("education_text", ""))
-        
-        # Extraction expériences structurées
-        experiences = self._extract_experiences(parsed_cv.get("experience_text", ""))
+        education_level = extract_education_level(education_text, education_lower)
+
+        # Extraction nom (première ligne souvent) ; découpage unique des
+        # premières lignes du CV
+        nom = self._extract_name(cv_text.splitlines()[:5])
+
+        # Extraction diplômes (optionnelle : inutile pour l'indexation)
+        diplomes = (
+            self._extract_diplomas(education_text, education_lower)
+            if extract_diplomas else []
+        )
+
+        # Extraction expériences structurées (optionnelle)
+        experiences = (
+            self._extract_experiences(parsed_cv.get("experience_text", ""))
+            if extract_experiences else []
+        )
         
         # Compétences normalisées
         skills_list = [s.strip() for s in parsed_cv.get("skills_list", [])]
@@ -105,47 +202,54 @@ class AgentProfil:
             "experience_text": parsed_cv.get("experience_text", ""),
             "education_text": parsed_cv.get("education_text", ""),
             "languages_text": parsed_cv.get("languages_text", ""),
+            "languages_list": parsed_cv.get("languages_list", []),
             "lettre_motivation": lettre_motivation,
             "raw_cv_text": cv_text,
         }
         
         return profil
     
-    def _extract_name(self, text: str) -> str:
-        """Extrait le nom depuis le début du CV."""
-        lines = text.split('\n')[:5]  # Premières lignes
+    def _extract_name(self, lines: List[str]) -> str:
+        """Extrait le nom depuis les premières lignes (pré-découpées) du CV."""
         for line in lines:
             line = line.strip()
             # Pattern: nom en majuscules ou première ligne significative
             if len(line) > 3 and len(line) < 50:
                 # Supprime les emails, téléphones
-                if '@' not in line and not re.search(r'\d{10}', line):
+                if '@' not in line and not _PHONE_RE.search(line):
                     return line
         return ""
     
-    def _extract_diplomas(self, education_text: str) -> List[Dict[str, str]]:
+    def _extract_diplomas(
+        self,
+        education_text: str,
+        education_lower: str = None
+    ) -> List[Dict[str, str]]:
         """Extrait les diplômes depuis le texte d'éducation."""
         if not education_text:
             return []
-        
+
+        if education_lower is None:
+            education_lower = education_text.lower()
+
         diplomes = []
-        lines = education_text.split('\n')
-        
-        for line in lines:
+        # Un seul .lower() sur tout le texte au lieu d'une allocation par ligne
+        lines = education_text.splitlines()
+        lines_lower = education_lower.splitlines()
+
+        for line, line_lower in zip(lines, lines_lower):
             line = line.strip()
             if not line or len(line) < 5:
                 continue
-            
-            # Détection de patterns de diplômes
-            diploma_types = ['master', 'licence', 'bachelor', 'doctorat', 'phd', 'bts', 'dut', 'ingénieur']
-            for diploma_type in diploma_types:
-                if diploma_type.lower() in line.lower():
-                    diplomes.append({
-                        "type": diploma_type,
-                        "description": line
-                    })
-                    break
-        
+
+            # Détection de patterns de diplômes (premier type trouvé sur la ligne)
+            match = _DIPLOMA_RE.search(line_lower)
+            if match:
+                diplomes.append({
+                    "type": match.group(0),
+                    "description": line
+                })
+
         return diplomes
     
     def _extract_experiences(self, experience_text: str) -> List[Dict[str, Any]]:
@@ -153,34 +257,32 @@ class AgentProfil:
         if not experience_text:
             return []
         
+        # Une seule passe C sur tout le texte : chaque année détectée ouvre
+        # une expérience qui s'étend jusqu'à l'année suivante.
+        # Début de la ligne portant chaque année (bornes des expériences) ;
+        # plusieurs années sur une même ligne ne comptent qu'une fois.
+        # finditer est consommé paresseusement : pas de liste de matches
+        # intermédiaire, même sur des textes pathologiquement denses en dates
+        anchors = []
+        last_start = -1
+        for m in _YEAR_RE.finditer(experience_text):
+            start = experience_text.rfind('\n', 0, m.start()) + 1
+            if start != last_start:
+                anchors.append((m.group(0), start))
+                last_start = start
+        if not anchors:
+            return []
+
+        ends = [start for _, start in anchors[1:]] + [len(experience_text)]
+
         experiences = []
-        # Découpage par lignes ou par dates
-        lines = experience_text.split('\n')
-        
-        current_exp = {}
-        for line in lines:
-            line = line.strip()
-            if not line:
-                if current_exp:
-                    experiences.append(current_exp)
-                    current_exp = {}
-                continue
-            
-            # Détection de dates (années)
-            year_match = re.search(r'(19|20)\d{2}', line)
-            if year_match:
-                if current_exp:
-                    experiences.append(current_exp)
-                current_exp = {
-                    "date": year_match.group(0),
-                    "description": line
-                }
-            elif current_exp:
-                current_exp["description"] += " " + line
-        
-        if current_exp:
-            experiences.append(current_exp)
-        
+        for (date, start), end in zip(anchors, ends):
+            description = " ".join(experience_text[start:end].split())
+            experiences.append({
+                "date": date,
+                "description": description
+            })
+
         return experiences
     
     def _generer_commentaire(
@@ -197,9 +299,9 @@ class AgentProfil:
         # Commentaire basique sans LLM
         commentaire_parts = []
         
-        # Compétences
+        # Compétences (la normalisation de l'offre est mémoïsée entre candidats)
         candidate_skills = set(s.lower() for s in profil.get("skills_list", []))
-        required_skills = set(s.lower() for s in job_profile.get("skills_obligatoires", []))
+        required_skills = _normalize_skills(tuple(job_profile.get("skills_obligatoires", [])))
         matched_skills = candidate_skills & required_skills
         
         if matched_skills:
@@ -237,6 +339,8 @@ class AgentProfil:
         score: float
     ) -> str:
         """Génère un commentaire avec LLM."""
+        # Seule la partie candidat est formatée à chaque appel ; le bloc
+        # décrivant l'offre est mis en cache par _job_prompt_fragment
         prompt = f"""
 Tu es un agent RH expert. Analyse le profil suivant et génère un commentaire justificatif
 pour un score de {score:.1f}/100.
@@ -246,13 +350,7 @@ Profil candidat:
 - Compétences: {', '.join(profil.get('skills_list', [])[:10])}
 - Éducation: {profil.get('education_level', 'N/A')}
 
-Profil requis:
-- Poste: {job_profile.get('poste', 'N/A')}
-- Expérience min: {job_profile.get('exp_min', 'N/A')} ans
-- Compétences requises: {', '.join(job_profile.get('skills_obligatoires', [])[:10])}
-
-Génère un commentaire concis (2-3 phrases) expliquant le score.
-"""
+""" + _job_prompt_fragment(job_profile)
         try:
             response = self.llm(prompt)
             return response if isinstance(response, str) else str(response)
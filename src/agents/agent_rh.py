@@ -1,10 +1,27 @@
 ﻿import re
 import json
+from functools import lru_cache
 from typing import Any, Dict, List, Optional
 from src.utils.job_description_parser import parse_job_description_text
 
+# orjson (2-3× plus rapide) si disponible, json standard sinon
+try:
+    import orjson
+
+    def _jdumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode()
+except ImportError:
+    def _jdumps(obj: Any) -> str:
+        return json.dumps(obj, ensure_ascii=False)
+
+# parse_job_description_text est une fonction pure du texte : mémoïsée pour
+# les flux batch/Streamlit où la même offre est re-parsée par candidat.
+# Les appelants copient le résultat avant de le muter.
+_parse_job_description_cached = lru_cache(maxsize=128)(parse_job_description_text)
+
 # Liste élargie d'intitulés de poste pour couvrir data/produit/ingénierie/ops/IT
-JOB_TITLES = [
+# (tuple : constante figée, pas de réallocation possible)
+JOB_TITLES = (
     "data scientist",
     "data analyst",
     "ml engineer",
@@ -49,7 +66,180 @@ JOB_TITLES = [
     "qa engineer",
     "test engineer",
     "automation engineer",
-]
+)
+
+# Mots-clés techniques/métier recherchés dans les descriptions, construits
+# une seule fois au lieu d'un littéral de liste par appel
+_KEYWORDS = (
+    "python",
+    "r ",
+    "sql",
+    "power bi",
+    "tableau",
+    "excel",
+    "pandas",
+    "spark",
+    "dbt",
+    "airflow",
+    "ml",
+    "machine learning",
+    "deep learning",
+    "nlp",
+    "rag",
+    "llm",
+    "pytorch",
+    "tensorflow",
+    "cloud",
+    "azure",
+    "aws",
+    "gcp",
+    "docker",
+    "kubernetes",
+    "terraform",
+    "javascript",
+    "typescript",
+    "react",
+    "vue",
+    "node",
+    "java",
+    "c#",
+    "dotnet",
+    "go",
+    "rust",
+    "logistique",
+    "supply chain",
+    "sap",
+    "erp",
+    "finance",
+    "comptabilite",
+    "risk",
+    "assurance",
+)
+
+def _kw_pattern(keyword: str) -> str:
+    """Motif d'un mot-clé, borné par \\b là où le caractère de bord le permet.
+
+    "r " (le langage) devient ainsi r"\\br\\b" ; "c#" ne prend pas de \\b
+    final car '#' n'est pas un caractère de mot.
+    """
+    keyword = keyword.strip()
+    pattern = re.escape(keyword)
+    if keyword[0].isalnum() or keyword[0] == "_":
+        pattern = r"\b" + pattern
+    if keyword[-1].isalnum() or keyword[-1] == "_":
+        pattern = pattern + r"\b"
+    return pattern
+
+
+# Alternation unique (une passe C sur la description) au lieu d'un test de
+# sous-chaîne Python par mot-clé ; triée par longueur décroissante pour que
+# le match le plus long gagne à position égale
+_KW_RE = re.compile(
+    "|".join(_kw_pattern(k) for k in sorted(_KEYWORDS, key=len, reverse=True))
+)
+
+
+# --- Scanner single-pass des détecteurs -------------------------------------
+#
+# Plutôt qu'une rafale de tests `token in desc` (un parcours Python de la
+# description par token), toutes les catégories sont compilées dans une seule
+# alternation : la description est parcourue une fois en C et chaque match est
+# dispatché vers sa (ses) catégorie(s).
+
+# La description est repliée en ASCII (accents supprimés) avant le scan :
+# les tables ne contiennent donc que les variantes non accentuées
+_FOLD = str.maketrans("àâäéèêëïîôöùûüç", "aaaeeeeiioouuuc")
+
+_SENIORITE_TOKENS = {
+    "junior": ("junior", "debutant", "entry"),
+    "senior": ("senior", "experimente", "lead"),
+    "intern": ("alternance", "apprentissage", "intern"),
+}
+
+_LANGUE_TOKENS = {
+    "anglais": ("anglais", "english"),
+    "francais": ("francais", "french"),
+    "espagnol": ("espagnol", "spanish"),
+    "allemand": ("allemand", "german"),
+}
+
+_CONTRAT_TOKENS = {
+    "CDI": ("cdi",),
+    "CDD": ("cdd",),
+    "Stage": ("stage",),
+    "Alternance": ("alternance", "apprentissage"),
+    "Freelance": ("freelance", "indep"),
+}
+
+_LIEU_TOKENS = (
+    "paris", "lyon", "lille", "remote", "teletravail", "nantes",
+    "bordeaux", "levallois", "perret", "idf", "ile-de-france",
+)
+
+# token -> [(catégorie, label), ...] ; un même token peut servir plusieurs
+# catégories (ex. "alternance" : séniorité et contrat)
+_TOKEN_TARGETS: Dict[str, List[tuple]] = {}
+
+
+def _register_tokens(categorie: str, label: str, tokens) -> None:
+    for token in tokens:
+        _TOKEN_TARGETS.setdefault(token, []).append((categorie, label))
+
+
+for _title in JOB_TITLES:
+    _register_tokens("poste", _title, (_title,))
+for _label, _tokens in _SENIORITE_TOKENS.items():
+    _register_tokens("seniorite", _label, _tokens)
+for _label, _tokens in _LANGUE_TOKENS.items():
+    _register_tokens("langue", _label, _tokens)
+for _label, _tokens in _CONTRAT_TOKENS.items():
+    _register_tokens("contrat", _label, _tokens)
+for _lieu in _LIEU_TOKENS:
+    _register_tokens("lieu", _lieu, (_lieu,))
+
+# Alternatives triées par longueur décroissante : à position égale, le
+# match le plus long gagne (ex. "machine learning engineer" avant "ml engineer")
+_SCAN_RE = re.compile(
+    "|".join(re.escape(tok) for tok in sorted(_TOKEN_TARGETS, key=len, reverse=True))
+)
+
+
+# Patterns compilés une fois au chargement du module (pas de dépendance au
+# cache LRU interne de re, évincable sous charge)
+_EXP_RES = (
+    re.compile(r"(\d+)\s*ans? d[' ]exp"),
+    re.compile(r"(\d+)\+?\s*years"),
+)
+
+
+def _freeze(value):
+    """Convertit récursivement dicts/listes en tuples hashables (clé de cache)."""
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+# Cache des analyses par règles : la même offre analysée pour N candidats
+# n'est parsée qu'une fois. Clé = (description, critères figés, contexte CV
+# figé) ; borné par purge complète (les lots homogènes n'en approchent jamais
+# la taille). lru_cache n'est pas applicable directement : les critères sont
+# des dicts non hashables et le résultat doit rester un dict frais.
+_RULES_CACHE: Dict[tuple, Dict] = {}
+_RULES_CACHE_MAX = 128
+
+
+def _scan_description(desc: str) -> Dict[str, List[str]]:
+    """Une passe sur la description : labels détectés par catégorie (ordre du texte)."""
+    hits: Dict[str, List[str]] = {
+        "poste": [], "seniorite": [], "langue": [], "contrat": [], "lieu": []
+    }
+    for m in _SCAN_RE.finditer(desc):
+        for categorie, label in _TOKEN_TARGETS[m.group(0)]:
+            hits[categorie].append(label)
+    return hits
+
 
 class AgentRH:
     def __init__(self, llm: Any = None):
@@ -68,14 +258,32 @@ class AgentRH:
         Peut accepter un CV déjà parsé (JSON/dict) pour conserver un contexte minimal.
         """
         criteres = criteres or {}
-        desc = description_poste.lower()
+        # Normalisation unique : minuscules + repli des accents, les
+        # détecteurs ne scannent ensuite que des littéraux non accentués
+        desc = description_poste.lower().translate(_FOLD)
 
         if self.llm and prefer_llm:
+            # Branche non déterministe : jamais mise en cache
             parsed = self._extract_with_llm(description_poste, criteres, cv_parsed)
             if parsed:
                 return parsed
 
-        return self._extract_with_rules(desc, description_poste, criteres, cv_parsed)
+        try:
+            key = (description_poste, _freeze(criteres), _freeze(cv_parsed))
+        except TypeError:
+            # Valeur non hashable dans les critères : analyse sans cache
+            return self._extract_with_rules(desc, description_poste, criteres, cv_parsed)
+
+        cached = _RULES_CACHE.get(key)
+        if cached is None:
+            if len(_RULES_CACHE) >= _RULES_CACHE_MAX:
+                _RULES_CACHE.clear()
+            cached = _RULES_CACHE[key] = self._extract_with_rules(
+                desc, description_poste, criteres, cv_parsed
+            )
+        # Copie superficielle : l'appelant peut remplacer des clés de premier
+        # niveau sans corrompre l'entrée de cache
+        return dict(cached)
 
     def analyser_offre_struct(
         self,
@@ -92,7 +300,9 @@ class AgentRH:
             if parsed:
                 return parsed
 
-        parsed = parse_job_description_text(description_poste)
+        # Copie superficielle du résultat mémoïsé : les affectations de clés
+        # ci-dessous ne doivent pas muter l'entrée de cache
+        parsed = dict(_parse_job_description_cached(description_poste))
         parsed["job_title"] = criteres.get("poste") or parsed.get("job_title", "")
         parsed["exp_min"] = criteres.get("exp_min", parsed.get("exp_min"))
         parsed["exp_max"] = criteres.get("exp_max", parsed.get("exp_max"))
@@ -136,7 +346,7 @@ Description de poste :
 {description_poste}
 
 Critères donnés par le recruteur (prioritaires si renseignés) :
-{json.dumps(criteres, ensure_ascii=False)}
+{_jdumps(criteres)}
 """
         try:
             llm_response = self.llm(prompt)
@@ -157,9 +367,9 @@ Critères donnés par le recruteur (prioritaires si renseignés) :
     ) -> Dict:
         """Extraction basique par règles et regex."""
 
-        def find_number(patterns: List[str]) -> Optional[int]:
+        def find_number(patterns) -> Optional[int]:
             for pat in patterns:
-                m = re.search(pat, desc)
+                m = pat.search(desc)
                 if m:
                     try:
                         return int(m.group(1))
@@ -167,24 +377,27 @@ Critères donnés par le recruteur (prioritaires si renseignés) :
                         continue
             return None
 
-        exp_min = criteres.get("exp_min") or find_number([r"(\d+)\s*ans? d[' ]exp", r"(\d+)\+?\s*years"])
+        exp_min = criteres.get("exp_min") or find_number(_EXP_RES)
         exp_max = criteres.get("exp_max")
 
         skills_obl = criteres.get("skills_obligatoires") or []
         skills_opt = criteres.get("skills_optionnelles") or []
 
+        # Une seule passe de scan pour poste/séniorité/langues/contrat
+        hits = _scan_description(desc)
+
         profil = {
-            "poste": criteres.get("poste") or self._detect_poste(desc),
-            "seniorite": criteres.get("seniorite") or self._detect_seniorite(desc),
+            "poste": criteres.get("poste") or self._detect_poste(hits),
+            "seniorite": criteres.get("seniorite") or self._detect_seniorite(hits),
             "exp_min": exp_min,
             "exp_max": exp_max,
             "skills_obligatoires": skills_obl,
             "skills_optionnelles": skills_opt,
-            "langues": criteres.get("langues") or self._detect_langues(desc),
-            "lieu": criteres.get("lieu") or self._detect_lieu(desc),
+            "langues": criteres.get("langues") or self._detect_langues(hits),
+            "lieu": criteres.get("lieu") or self._detect_lieu(hits),
             "salaire_min": criteres.get("salaire_min"),
             "salaire_max": criteres.get("salaire_max"),
-            "contrat": criteres.get("contrat") or self._detect_contrat(desc),
+            "contrat": criteres.get("contrat") or self._detect_contrat(hits),
             "mots_cles": criteres.get("mots_cles") or self._detect_keywords(desc),
             "notes_libres": criteres.get("notes_libres", ""),
             "raw_description": description_poste.strip(),
@@ -193,101 +406,45 @@ Critères donnés par le recruteur (prioritaires si renseignés) :
         profil["cv_context"] = self._extract_cv_context(cv_parsed) if cv_parsed else None
         return profil
 
-    def _detect_poste(self, desc: str) -> str:
-        for title in JOB_TITLES:
-            if title in desc:
-                return title
-        return ""
+    def _detect_poste(self, hits: Dict[str, List[str]]) -> str:
+        """Premier poste du texte ; à offset égal le plus long gagne.
 
-    def _detect_seniorite(self, desc: str) -> str:
-        if any(k in desc for k in ["junior", "debutant", "débutant", "entry"]):
+        Garanti par _SCAN_RE : alternatives triées par longueur décroissante
+        ("machine learning engineer" est testé avant "ml engineer") et le
+        scan consomme le match, donc un titre court contenu dans un titre
+        long ne peut pas le masquer.
+        """
+        postes = hits["poste"]
+        return postes[0] if postes else ""
+
+    def _detect_seniorite(self, hits: Dict[str, List[str]]) -> str:
+        trouves = set(hits["seniorite"])
+        if "junior" in trouves:
             return "junior"
-        if any(k in desc for k in ["senior", "experimente", "expérimenté", "lead"]):
+        if "senior" in trouves:
             return "senior"
-        if "alternance" in desc or "apprentissage" in desc or "intern" in desc:
+        if "intern" in trouves:
             return "intern"
         return "intermediaire"
 
-    def _detect_langues(self, desc: str) -> List[str]:
-        langs: List[str] = []
-        if "anglais" in desc or "english" in desc:
-            langs.append("anglais")
-        if "francais" in desc or "français" in desc or "french" in desc:
-            langs.append("francais")
-        if "espagnol" in desc or "spanish" in desc:
-            langs.append("espagnol")
-        if "allemand" in desc or "german" in desc:
-            langs.append("allemand")
-        return langs
-
-    def _detect_lieu(self, desc: str) -> str:
-        m = re.search(r"(paris|lyon|lille|remote|télétravail|teletravail|nantes|bordeaux|levallois|perret|idf|ile-de-france)", desc)
-        return m.group(1) if m else ""
-
-    def _detect_contrat(self, desc: str) -> str:
-        if "cdi" in desc:
-            return "CDI"
-        if "cdd" in desc:
-            return "CDD"
-        if "stage" in desc:
-            return "Stage"
-        if "alternance" in desc or "apprentissage" in desc:
-            return "Alternance"
-        if "freelance" in desc or "indep" in desc or "indépendant" in desc:
-            return "Freelance"
+    def _detect_langues(self, hits: Dict[str, List[str]]) -> List[str]:
+        trouves = set(hits["langue"])
+        return [l for l in ("anglais", "francais", "espagnol", "allemand") if l in trouves]
+
+    def _detect_lieu(self, hits: Dict[str, List[str]]) -> str:
+        lieux = hits["lieu"]
+        return lieux[0] if lieux else ""
+
+    def _detect_contrat(self, hits: Dict[str, List[str]]) -> str:
+        trouves = set(hits["contrat"])
+        for contrat in ("CDI", "CDD", "Stage", "Alternance", "Freelance"):
+            if contrat in trouves:
+                return contrat
         return ""
 
     def _detect_keywords(self, desc: str) -> List[str]:
-        keywords: List[str] = []
-        for kw in [
-            "python",
-            "r ",
-            "sql",
-            "power bi",
-            "tableau",
-            "excel",
-            "pandas",
-            "spark",
-            "dbt",
-            "airflow",
-            "ml",
-            "machine learning",
-            "deep learning",
-            "nlp",
-            "rag",
-            "llm",
-            "pytorch",
-            "tensorflow",
-            "cloud",
-            "azure",
-            "aws",
-            "gcp",
-            "docker",
-            "kubernetes",
-            "terraform",
-            "javascript",
-            "typescript",
-            "react",
-            "vue",
-            "node",
-            "java",
-            "c#",
-            "dotnet",
-            "go",
-            "rust",
-            "logistique",
-            "supply chain",
-            "sap",
-            "erp",
-            "finance",
-            "comptabilite",
-            "comptabilité",
-            "risk",
-            "assurance",
-        ]:
-            if kw in desc:
-                keywords.append(kw.strip())
-        return keywords
+        # Une seule passe, dédoublonnée en gardant l'ordre du texte
+        return list(dict.fromkeys(_KW_RE.findall(desc)))
 
     def _extract_cv_context(self, cv_parsed: Dict[str, Any]) -> Dict[str, Any]:
         """Sélectionne quelques champs utiles du CV parsé (id, skills, langues, email)."""
@@ -325,7 +482,7 @@ Description de poste :
 {description_poste}
 
 Critères donnés par le recruteur (prioritaires si renseignés) :
-{json.dumps(criteres, ensure_ascii=False)}
+{_jdumps(criteres)}
 """
         try:
             llm_response = self.llm(prompt)
@@ -1,8 +1,41 @@
 """AgentSoftSkills : évaluation des soft skills via LLM."""
+import re
+from itertools import islice
 from typing import Any, Dict, List, Optional
 
 from src.utils.scoring import calculate_soft_skills_score
 
+_WORD_RE = re.compile(r"\w+")
+# Comptage de mots sans matérialiser la liste de str.split()
+_WS_RE = re.compile(r"\S+")
+
+# Carte des soft skills et de leurs déclencheurs, figée au chargement du
+# module au lieu d'être reconstruite à chaque appel
+_SOFT_SKILLS_MAP = {
+    "teamwork": ("équipe", "collaboration", "teamwork", "collaborer", "coopération"),
+    "communication": ("communication", "communiquer", "présenter", "expliquer", "oral", "écrit"),
+    "leadership": ("lead", "leader", "diriger", "management", "gérer", "encadrer"),
+    "autonomy": ("autonome", "autonomie", "indépendant", "indépendance", "initiative"),
+    "problem_solving": ("résoudre", "solution", "problème", "challenge", "défi", "analyser"),
+    "adaptability": ("adaptable", "flexible", "changement", "évolution", "agile"),
+    "motivation": ("motivé", "motivation", "passion", "intéressé", "enthousiaste", "désireux"),
+    "creativity": ("créatif", "créativité", "innovation", "imagination", "original"),
+    "organization": ("organisé", "organisation", "planification", "méthodique", "structuré"),
+    "stress_management": ("stress", "pression", "sous pression", "calme", "sérénité"),
+}
+
+# Déclencheurs mono-mot en frozenset (testés par intersection d'ensembles) ;
+# les rares déclencheurs multi-mots restent testés par sous-chaîne
+_SOFT_SKILLS_SINGLE = {
+    name: frozenset(t for t in triggers if " " not in t)
+    for name, triggers in _SOFT_SKILLS_MAP.items()
+}
+_SOFT_SKILLS_MULTI = {
+    name: tuple(t for t in triggers if " " in t)
+    for name, triggers in _SOFT_SKILLS_MAP.items()
+    if any(" " in t for t in triggers)
+}
+
 
 class AgentSoftSkills:
     """
@@ -52,18 +85,24 @@ class AgentSoftSkills:
             keywords
         )
         
-        # Détection des soft skills
-        soft_skills_detected = self._detect_soft_skills(
-            lettre_motivation + " " + experience_text
-        )
-        
+        # Nombre de mots calculé une seule fois ; le texte concaténé n'est
+        # alloué que si le commentaire doit y chercher des mots-clés
+        word_count = sum(1 for _ in _WS_RE.finditer(lettre_motivation))
+        full_text = (lettre_motivation + " " + experience_text) if keywords else None
+
+        # Détection des soft skills : chaque source est scannée telle
+        # quelle, sans concaténation intermédiaire
+        soft_skills_detected = self._detect_soft_skills(lettre_motivation, experience_text)
+
         # Génération du commentaire
         commentaire_softskills = self._generer_commentaire(
             lettre_motivation,
             experience_text,
             soft_skills_detected,
             score_softskills,
-            keywords
+            keywords,
+            word_count=word_count,
+            full_text=full_text
         )
         
         return {
@@ -72,28 +111,30 @@ class AgentSoftSkills:
             "soft_skills_detected": soft_skills_detected
         }
     
-    def _detect_soft_skills(self, text: str) -> List[str]:
-        """Détecte les soft skills mentionnés dans le texte."""
-        text_lower = text.lower()
-        
-        soft_skills_map = {
-            "teamwork": ["équipe", "collaboration", "teamwork", "collaborer", "coopération"],
-            "communication": ["communication", "communiquer", "présenter", "expliquer", "oral", "écrit"],
-            "leadership": ["lead", "leader", "diriger", "management", "gérer", "encadrer"],
-            "autonomy": ["autonome", "autonomie", "indépendant", "indépendance", "initiative"],
-            "problem_solving": ["résoudre", "solution", "problème", "challenge", "défi", "analyser"],
-            "adaptability": ["adaptable", "flexible", "changement", "évolution", "agile"],
-            "motivation": ["motivé", "motivation", "passion", "intéressé", "enthousiaste", "désireux"],
-            "creativity": ["créatif", "créativité", "innovation", "imagination", "original"],
-            "organization": ["organisé", "organisation", "planification", "méthodique", "structuré"],
-            "stress_management": ["stress", "pression", "sous pression", "calme", "sérénité"],
-        }
-        
+    def _detect_soft_skills(self, *texts: str) -> List[str]:
+        """Détecte les soft skills mentionnés dans les textes fournis.
+
+        Chaque source (lettre, expérience, ...) est tokenisée séparément et
+        les ensembles sont unis : pas de concaténation des textes. Chaque
+        skill est ensuite testé par intersection d'ensembles au lieu d'un
+        scan de sous-chaîne par mot-clé.
+        """
+        lowered = [t.lower() for t in texts if t]
+        tokens = set()
+        for text_lower in lowered:
+            tokens.update(_WORD_RE.findall(text_lower))
+
         detected = []
-        for skill_name, keywords_list in soft_skills_map.items():
-            if any(keyword in text_lower for keyword in keywords_list):
+        for skill_name, triggers in _SOFT_SKILLS_SINGLE.items():
+            if triggers & tokens:
                 detected.append(skill_name)
-        
+            elif any(
+                multi in text_lower
+                for multi in _SOFT_SKILLS_MULTI.get(skill_name, ())
+                for text_lower in lowered
+            ):
+                detected.append(skill_name)
+
         return detected
     
     def _generer_commentaire(
@@ -102,26 +143,35 @@ class AgentSoftSkills:
         experience_text: str,
         soft_skills_detected: List[str],
         score: float,
-        keywords: List[str]
+        keywords: List[str],
+        word_count: Optional[int] = None,
+        full_text: Optional[str] = None
     ) -> str:
-        """Génère un commentaire justificatif."""
-        
+        """Génère un commentaire justificatif.
+
+        word_count et full_text sont fournis par evaluer_softskills pour
+        éviter de les recalculer ; ils sont reconstruits si absents (appel
+        de repli depuis le chemin LLM).
+        """
+
         if self.llm:
             return self._generer_commentaire_llm(
                 lettre_motivation, experience_text, soft_skills_detected, score, keywords
             )
         
-        # Commentaire basique sans LLM
+        # Commentaire basique sans LLM (islice : pas de sous-liste allouée
+        # juste pour tronquer l'énumération)
         commentaire_parts = []
-        
+
         if soft_skills_detected:
             commentaire_parts.append(
-                f"Soft skills détectés: {', '.join(soft_skills_detected[:5])}"
+                f"Soft skills détectés: {', '.join(islice(soft_skills_detected, 5))}"
             )
         
         # Analyse de la lettre de motivation
         if lettre_motivation:
-            word_count = len(lettre_motivation.split())
+            if word_count is None:
+                word_count = sum(1 for _ in _WS_RE.finditer(lettre_motivation))
             if word_count > 200:
                 commentaire_parts.append("Lettre de motivation détaillée et structurée")
             elif word_count > 100:
@@ -131,13 +181,28 @@ class AgentSoftSkills:
         else:
             commentaire_parts.append("Aucune lettre de motivation fournie")
         
-        # Mots-clés recherchés
+        # Mots-clés recherchés : lookup O(1) dans l'ensemble de tokens pour
+        # les mots simples, sous-chaîne seulement pour les expressions
         if keywords:
-            text_lower = (lettre_motivation + " " + experience_text).lower()
-            matched_keywords = [kw for kw in keywords if kw.lower() in text_lower]
+            if full_text is None:
+                full_text = lettre_motivation + " " + experience_text
+            text_lower = full_text.lower()
+            tokens = frozenset(_WORD_RE.findall(text_lower))
+            kws_lower = [k.lower() for k in keywords]
+            if any(" " in kw for kw in kws_lower):
+                # Cas mixte : lookup de token pour les mots simples,
+                # sous-chaîne pour les expressions
+                matched_keywords = [
+                    kw for kw in kws_lower
+                    if (kw in tokens if " " not in kw else kw in text_lower)
+                ]
+            else:
+                # Cas courant (mots simples uniquement) : boucle entière
+                # poussée dans le builtin filter, en C
+                matched_keywords = list(filter(tokens.__contains__, kws_lower))
             if matched_keywords:
                 commentaire_parts.append(
-                    f"Mots-clés recherchés trouvés: {', '.join(matched_keywords[:3])}"
+                    f"Mots-clés recherchés trouvés: {', '.join(islice(matched_keywords, 3))}"
                 )
         
         # Évaluation globale
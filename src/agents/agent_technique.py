@@ -1,7 +1,33 @@
 """AgentTechnique : analyse des compétences techniques."""
+from functools import lru_cache
+from itertools import islice
 from typing import Any, Dict, List, Optional
 
+import numpy as np
+
 from src.utils.scoring import calculate_technical_score
+from src.utils.scoring_numba import technical_scores_from_presence
+
+
+@lru_cache(maxsize=4096)
+def _norm_skill(skill: str) -> str:
+    """Normalise une compétence (mémoïsé par chaîne).
+
+    Les intitulés de compétences ("Python", "SQL", ...) se répètent
+    massivement d'un candidat à l'autre : le cache évite de re-normaliser
+    les mêmes chaînes sur tout un lot.
+    """
+    return skill.lower().strip()
+
+
+@lru_cache(maxsize=256)
+def _normalize_skills(skills: tuple) -> frozenset:
+    """Normalise un tuple de compétences en frozenset lowercase (mémoïsé).
+
+    Les compétences de l'offre (requises/optionnelles) sont identiques
+    pour tous les candidats d'un lot : une seule normalisation suffit.
+    """
+    return frozenset(map(_norm_skill, skills))
 
 
 class AgentTechnique:
@@ -44,19 +70,23 @@ class AgentTechnique:
             - skills_missing: compétences manquantes
         """
         optional_skills = optional_skills or []
-        
-        # Normalisation
-        candidate_set = {s.lower().strip() for s in candidate_skills}
-        required_set = {s.lower().strip() for s in required_skills}
-        optional_set = {s.lower().strip() for s in optional_skills}
-        
-        # Calcul du score
+
+        # Normalisation : le candidat change à chaque appel, l'offre est
+        # mémoïsée entre candidats
+        candidate_set = frozenset(map(_norm_skill, candidate_skills))
+        required_set = _normalize_skills(tuple(required_skills))
+        optional_set = _normalize_skills(tuple(optional_skills))
+
+        # Calcul du score (les frozensets sont itérés tels quels, pas de
+        # conversion en liste intermédiaire)
         score_technique = calculate_technical_score(
-            list(candidate_set),
-            list(required_set)
+            candidate_set,
+            required_set
         )
-        
+
         # Détection des compétences correspondantes et manquantes
+        # (arithmétique d'ensembles en C ; conversion en liste seulement
+        # pour le dict de retour)
         skills_matched = list(candidate_set & required_set)
         skills_missing = list(required_set - candidate_set)
         skills_bonus = list(candidate_set & optional_set)
@@ -79,6 +109,58 @@ class AgentTechnique:
             "coverage": len(skills_matched) / len(required_set) if required_set else 0.0
         }
     
+    def evaluer_technique_batch(
+        self,
+        candidates_skills: List[List[str]],
+        required_skills: List[str],
+        optional_skills: List[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Évalue les compétences techniques d'un lot de candidats en vectorisé.
+
+        Construit une matrice booléenne (N candidats × R compétences
+        requises) puis calcule matchs, couverture et scores en quelques
+        opérations NumPy au lieu de N appels Python.
+
+        Args:
+            candidates_skills: Une liste de compétences par candidat
+            required_skills: Compétences techniques requises (communes au lot)
+            optional_skills: Compétences optionnelles (non scorées ici,
+                comme dans le chemin unitaire)
+
+        Returns:
+            Dict avec:
+            - scores_techniques: array (N,) des scores (0-100)
+            - coverage: array (N,) des taux de couverture
+            - presence: matrice booléenne (N, R) candidat × compétence
+            - vocab: compétence normalisée -> index de colonne
+        """
+        required_set = _normalize_skills(tuple(required_skills))
+        vocab = {skill: i for i, skill in enumerate(sorted(required_set))}
+        n, r = len(candidates_skills), len(vocab)
+
+        presence = np.zeros((n, r), dtype=bool)
+        for i, skills in enumerate(candidates_skills):
+            cols = [vocab[s] for s in set(map(_norm_skill, skills)) if s in vocab]
+            if cols:
+                presence[i, cols] = True
+
+        # Même barème que calculate_technical_score sans optionnelles :
+        # 70% du score au prorata des compétences requises couvertes.
+        # Le noyau est JIT-compilé si Numba est disponible, NumPy sinon.
+        scores = technical_scores_from_presence(presence)
+        if r:
+            coverage = presence.sum(axis=1) / r
+        else:
+            coverage = np.zeros(n, dtype=np.float64)
+
+        return {
+            "scores_techniques": scores,
+            "coverage": coverage,
+            "presence": presence,
+            "vocab": vocab
+        }
+
     def _generer_commentaire(
         self,
         skills_matched: List[str],
@@ -94,22 +176,23 @@ class AgentTechnique:
                 skills_matched, skills_missing, skills_bonus, score
             )
         
-        # Commentaire basique sans LLM
+        # Commentaire basique sans LLM (islice : pas de sous-liste allouée
+        # juste pour tronquer l'énumération)
         commentaire_parts = []
-        
+
         if skills_matched:
             commentaire_parts.append(
-                f"Compétences techniques maîtrisées: {', '.join(skills_matched[:5])}"
+                f"Compétences techniques maîtrisées: {', '.join(islice(skills_matched, 5))}"
             )
-        
+
         if skills_missing:
             commentaire_parts.append(
-                f"Compétences manquantes: {', '.join(skills_missing[:5])}"
+                f"Compétences manquantes: {', '.join(islice(skills_missing, 5))}"
             )
-        
+
         if skills_bonus:
             commentaire_parts.append(
-                f"Compétences bonus: {', '.join(skills_bonus[:3])}"
+                f"Compétences bonus: {', '.join(islice(skills_bonus, 3))}"
             )
         
         # Évaluation globale
@@ -1,9 +1,9 @@
-"""Script pour prétraiter les données (CV et offres)."""
-import sys
-from pathlib import Path
+"""Script pour prétraiter les données (CV et offres).
 
-# Ajouter le répertoire parent au path
-sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+À lancer en module depuis la racine du projet (cf. QUICKSTART) :
+    python -m src.app.preprocess_data
+"""
+from concurrent.futures import ProcessPoolExecutor
 
 from src.utils.data_utils import preprocess_all_raw
 from src.utils.job_description_parser import preprocess_all_jobs
@@ -15,12 +15,16 @@ def main():
     print("PRÉTRAITEMENT DES DONNÉES")
     print("="*60)
     
-    print("\n1. Prétraitement des CV...")
-    candidates = preprocess_all_raw()
+    # CV et offres lisent des répertoires d'entrée indépendants : les deux
+    # phases (extraction PDF + parsing regex) tournent dans deux process en
+    # parallèle au lieu de s'enchaîner séquentiellement
+    print("\n1. Prétraitement des CV et des offres d'emploi (en parallèle)...")
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        fut_candidates = executor.submit(preprocess_all_raw)
+        fut_jobs = executor.submit(preprocess_all_jobs)
+        candidates = fut_candidates.result()
+        jobs = fut_jobs.result()
     print(f"   ✓ {len(candidates)} CV(s) traité(s)")
-    
-    print("\n2. Prétraitement des offres d'emploi...")
-    jobs = preprocess_all_jobs()
     print(f"   ✓ {len(jobs)} offre(s) traitée(s)")
     
     print("\n" + "="*60)
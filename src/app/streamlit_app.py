@@ -1,13 +1,15 @@
 """Interface utilisateur Streamlit pour la sélection de candidats."""
+import os
+
 import streamlit as st
 import json
 from pathlib import Path
 from typing import Dict, List, Any
 
-from src.main import MultiAgentPipeline
-from src.rag.build_index import build_index
-from src.utils.data_utils import extract_text, list_raw_files
-from src.config import DATA_DIR, JOBS_DIR
+# Les imports lourds (pipeline → agents, construction d'index → chromadb,
+# sentence-transformers) sont faits paresseusement dans les handlers qui les
+# utilisent : la page se rend sans payer leur coût de chargement
+from src.config import DATA_DIR, JOBS_DIR, PARSED_DIR, TOP_K_DISPLAY
 
 
 # Configuration de la page
@@ -28,17 +30,81 @@ if "rag_initialized" not in st.session_state:
     st.session_state.rag_initialized = False
 
 
+@st.cache_data(ttl=60, show_spinner=False)
+def _list_files(directory: str, suffixes: tuple) -> List[Path]:
+    """Fichiers d'un répertoire filtrés par extensions, en un seul scandir.
+
+    Remplace les paires de glob ("*.pdf") + glob ("*.txt") — deux parcours
+    du répertoire chacune — et le cache (ttl 60 s) évite de re-scanner le
+    disque à chaque rerun Streamlit.
+    """
+    d = Path(directory)
+    if not d.exists():
+        return []
+    with os.scandir(d) as entries:
+        return [
+            Path(entry.path)
+            for entry in entries
+            if entry.is_file() and entry.name.endswith(suffixes)
+        ]
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _corpus_stats() -> Dict[str, int]:
+    """Compteurs candidats/offres affichés dans la sidebar.
+
+    Une seule entrée de cache pour les deux répertoires : les reruns ne
+    refont ni les exists() ni les parcours ; invalidé explicitement après
+    une reconstruction d'index.
+    """
+    return {
+        "n_candidats": len(_list_files(str(PARSED_DIR), (".json",))),
+        "n_offres": len(_list_files(str(JOBS_DIR), (".pdf", ".txt"))),
+    }
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _extract_text_cached(path_str: str, mtime: float) -> str:
+    """extract_text mis en cache par (chemin, mtime).
+
+    Chaque interaction Streamlit relance le script : sans cache, le même
+    PDF serait re-parsé à chaque rerun. Le mtime dans la clé invalide
+    l'entrée si le fichier change sur disque.
+    """
+    from src.utils.data_utils import extract_text
+
+    return extract_text(Path(path_str))
+
+
+@st.cache_resource(show_spinner=False)
+def get_pipeline() -> "MultiAgentPipeline":
+    """Pipeline partagé, construit une seule fois par process.
+
+    st.cache_resource garantit que les agents et le moteur RAG (modèle
+    d'embedding, collection ChromaDB) ne sont chargés qu'une fois, au lieu
+    d'une instance par session utilisateur dans st.session_state.
+    """
+    from src.main import MultiAgentPipeline
+
+    pipeline = MultiAgentPipeline()
+    pipeline.initialize_rag()
+    return pipeline
+
+
 def initialize_pipeline():
     """Initialise le pipeline multi-agent."""
     if st.session_state.pipeline is None:
         with st.spinner("Initialisation du pipeline..."):
-            st.session_state.pipeline = MultiAgentPipeline()
             try:
-                st.session_state.pipeline.initialize_rag()
-                st.session_state.rag_initialized = True
-                st.success("Pipeline initialisé avec succès!")
+                pipeline = get_pipeline()
+                st.session_state.pipeline = pipeline
+                st.session_state.rag_initialized = pipeline.rag_engine is not None
+                if st.session_state.rag_initialized:
+                    st.success("Pipeline initialisé avec succès!")
+                else:
+                    st.warning("RAG non disponible. Le système fonctionnera sans pré-filtrage RAG.")
             except Exception as e:
-                st.warning(f"RAG non disponible: {e}. Le système fonctionnera sans pré-filtrage RAG.")
+                st.warning(f"Pipeline indisponible: {e}")
                 st.session_state.rag_initialized = False
 
 
@@ -57,7 +123,16 @@ with st.sidebar:
     if st.button("🔨 Construire/Rebuild l'Index", use_container_width=True):
         with st.spinner("Construction de l'index RAG..."):
             try:
+                from src.rag.build_index import build_index
+
                 builder = build_index(rebuild=True)
+                # Le pipeline en cache référence l'ancien index : on
+                # l'invalide pour qu'il soit reconstruit au prochain accès,
+                # et on rafraîchit les listings/compteurs de fichiers
+                get_pipeline.clear()
+                _list_files.clear()
+                _corpus_stats.clear()
+                st.session_state.pipeline = None
                 st.success("Index RAG construit avec succès!")
                 st.session_state.rag_initialized = True
             except Exception as e:
@@ -67,13 +142,9 @@ with st.sidebar:
     
     # Statistiques
     st.subheader("📊 Statistiques")
-    if PARSED_DIR.exists():
-        num_candidates = len(list(PARSED_DIR.glob("*.json")))
-        st.metric("Candidats indexés", num_candidates)
-    
-    if JOBS_DIR.exists():
-        num_jobs = len(list(JOBS_DIR.glob("*.pdf"))) + len(list(JOBS_DIR.glob("*.txt")))
-        st.metric("Offres disponibles", num_jobs)
+    stats = _corpus_stats()
+    st.metric("Candidats indexés", stats["n_candidats"])
+    st.metric("Offres disponibles", stats["n_offres"])
 
 
 # Interface principale
@@ -100,9 +171,7 @@ with tab1:
     
     if input_method == "📄 Fichier":
         # Liste des fichiers disponibles
-        job_files = []
-        if JOBS_DIR.exists():
-            job_files = list(JOBS_DIR.glob("*.pdf")) + list(JOBS_DIR.glob("*.txt"))
+        job_files = _list_files(str(JOBS_DIR), (".pdf", ".txt"))
         
         if job_files:
             selected_file = st.selectbox(
@@ -111,7 +180,9 @@ with tab1:
             )
             if selected_file:
                 file_path = JOBS_DIR / selected_file
-                job_description = extract_text(file_path)
+                job_description = _extract_text_cached(
+                    str(file_path), file_path.stat().st_mtime
+                )
         else:
             st.warning("Aucun fichier d'offre trouvé dans DATA/jobs/")
     
@@ -198,53 +269,72 @@ with tab1:
             if filter_rec != "Tous":
                 filtered_candidates = [
                     c for c in candidates
-                    if c.get("recommandation", "").lower() == filter_rec.lower()
+                    if c.recommandation.lower() == filter_rec.lower()
                 ]
             
-            # Affichage du tableau
-            for i, candidate in enumerate(filtered_candidates[:10], 1):  # Top 10
-                with st.container():
-                    col1, col2, col3, col4 = st.columns([2, 1, 1, 1])
-                    
-                    with col1:
-                        rec_color = {
-                            "fortement recommandé": "🟢",
-                            "recommandé": "🟡",
-                            "à considérer": "🟠",
-                            "à rejeter": "🔴"
-                        }.get(candidate.get("recommandation", "").lower(), "⚪")
-                        
-                        st.markdown(f"**{rec_color} {i}. {candidate.get('candidate_id', 'N/A')}**")
-                    
-                    with col2:
-                        st.metric("Score Global", f"{candidate.get('score_global', 0):.1f}")
-                    
-                    with col3:
-                        st.metric("Technique", f"{candidate.get('score_technique', 0):.1f}")
-                    
-                    with col4:
-                        st.metric("Soft Skills", f"{candidate.get('score_softskills', 0):.1f}")
-                    
-                    # Détails expandable
-                    with st.expander(f"📝 Détails - {candidate.get('candidate_id', 'N/A')}"):
-                        col_a, col_b, col_c = st.columns(3)
-                        with col_a:
-                            st.metric("Score Profil", f"{candidate.get('score_profil', 0):.1f}")
-                        with col_b:
-                            st.metric("Score Technique", f"{candidate.get('score_technique', 0):.1f}")
-                        with col_c:
-                            st.metric("Score Soft Skills", f"{candidate.get('score_softskills', 0):.1f}")
-                        
-                        st.markdown("**Justification:**")
-                        st.text_area(
-                            "Justification complète",
-                            value=candidate.get("justification", ""),
-                            height=150,
-                            disabled=True,
-                            label_visibility="collapsed"
+            # Affichage : une seule grille virtualisée (st.dataframe) au
+            # lieu de ~6 widgets par candidat, puis un unique bloc de
+            # détails pour le candidat choisi
+            top_candidates = filtered_candidates[:TOP_K_DISPLAY]
+
+            if top_candidates:
+                import pandas as pd
+
+                rec_icons = {
+                    "fortement recommandé": "🟢",
+                    "recommandé": "🟡",
+                    "à considérer": "🟠",
+                    "à rejeter": "🔴"
+                }
+                df = pd.DataFrame([
+                    {
+                        "Rang": i,
+                        "Candidat": c.candidate_id,
+                        "Score Global": c.score_global,
+                        "Profil": round(c.score_profil, 1),
+                        "Technique": round(c.score_technique, 1),
+                        "Soft Skills": round(c.score_softskills, 1),
+                        "Recommandation": f"{rec_icons.get(c.recommandation.lower(), '⚪')} "
+                                          f"{c.recommandation}",
+                    }
+                    for i, c in enumerate(top_candidates, 1)
+                ])
+                st.dataframe(
+                    df,
+                    use_container_width=True,
+                    hide_index=True,
+                    column_config={
+                        "Score Global": st.column_config.ProgressColumn(
+                            "Score Global", min_value=0, max_value=100, format="%.1f"
                         )
-                    
-                    st.markdown("---")
+                    }
+                )
+
+                # Détails : un seul expander, pour le candidat sélectionné
+                selected_id = st.selectbox(
+                    "📝 Détails du candidat",
+                    [c.candidate_id for c in top_candidates]
+                )
+                candidate = next(
+                    c for c in top_candidates if c.candidate_id == selected_id
+                )
+                with st.expander(f"📝 Détails - {candidate.candidate_id}", expanded=True):
+                    col_a, col_b, col_c = st.columns(3)
+                    with col_a:
+                        st.metric("Score Profil", f"{candidate.score_profil:.1f}")
+                    with col_b:
+                        st.metric("Score Technique", f"{candidate.score_technique:.1f}")
+                    with col_c:
+                        st.metric("Score Soft Skills", f"{candidate.score_softskills:.1f}")
+
+                    st.markdown("**Justification:**")
+                    st.text_area(
+                        "Justification complète",
+                        value=candidate.justification,
+                        height=150,
+                        disabled=True,
+                        label_visibility="collapsed"
+                    )
             
             # Rapport final
             st.subheader("📈 Rapport Final")
@@ -277,7 +367,7 @@ with tab2:
     with col1:
         st.markdown("### Candidats")
         if PARSED_DIR.exists():
-            candidates = list(PARSED_DIR.glob("*.json"))
+            candidates = _list_files(str(PARSED_DIR), (".json",))
             st.metric("Candidats parsés", len(candidates))
             
             if candidates:
@@ -292,7 +382,7 @@ with tab2:
     with col2:
         st.markdown("### Offres d'Emploi")
         if JOBS_DIR.exists():
-            jobs = list(JOBS_DIR.glob("*.pdf")) + list(JOBS_DIR.glob("*.txt"))
+            jobs = _list_files(str(JOBS_DIR), (".pdf", ".txt"))
             st.metric("Offres disponibles", len(jobs))
             
             if jobs:
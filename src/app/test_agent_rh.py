@@ -7,10 +7,18 @@ et écrit le résultat dans DATA/processed/jobs_parsed/<job_id>_agent_llm.json.
 
 from __future__ import annotations
 
+import hashlib
 import json
-import subprocess
+from functools import lru_cache
 from pathlib import Path
 
+import requests
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from src.agents.agent_rh import AgentRH
 from src.utils.job_description_parser import parse_job_description_file
 
@@ -18,25 +26,59 @@ from src.utils.job_description_parser import parse_job_description_file
 # Adaptable : nom du fichier d'offre et modèle Ollama
 JOB_FILE = Path("DATA/jobs/Stagiaire Logistique Performance & Projet - Lucas FRANCOIS.pdf")
 OLLAMA_MODEL = "llama3"  # à ajuster si besoin (ex. mistral)
+OLLAMA_URL = "http://localhost:11434/api/generate"
+
+# Session partagée : la connexion TCP vers le serveur Ollama est réutilisée
+# entre les prompts (pas de fork de process ni de rechargement du modèle
+# comme avec `ollama run` en sous-processus)
+_session = requests.Session()
 
 
 def ollama_llm(prompt: str) -> str:
     """
-    Appelle un modèle local via Ollama et renvoie la réponse brute.
-    Assure-toi qu'Ollama et le modèle sont installés.
+    Appelle un modèle local via l'API HTTP d'Ollama et renvoie la réponse brute.
+    Assure-toi qu'Ollama tourne (`ollama serve`) et que le modèle est installé.
     """
-    return subprocess.check_output(["ollama", "run", OLLAMA_MODEL, prompt], text=True)
+    r = _session.post(
+        OLLAMA_URL,
+        json={"model": OLLAMA_MODEL, "prompt": prompt, "stream": False},
+        timeout=120,
+    )
+    r.raise_for_status()
+    return r.json()["response"]
+
+
+# Cache disque des réponses LLM, clé = hash(modèle + prompt) : relancer le
+# script sur la même offre avec le même modèle répond instantanément
+OLLAMA_CACHE_DIR = Path(".ollama_cache")
+
+
+@lru_cache(maxsize=512)
+def ollama_llm_cached(prompt: str) -> str:
+    """ollama_llm avec deux niveaux de cache : mémoire (lru) puis disque."""
+    key = hashlib.blake2b((OLLAMA_MODEL + prompt).encode("utf-8")).hexdigest()
+    cache_file = OLLAMA_CACHE_DIR / f"{key}.txt"
+    if cache_file.exists():
+        return cache_file.read_text(encoding="utf-8")
+
+    response = ollama_llm(prompt)
+    OLLAMA_CACHE_DIR.mkdir(exist_ok=True)
+    cache_file.write_text(response, encoding="utf-8")
+    return response
 
 
 def main() -> None:
     job_path = JOB_FILE.resolve()
     jd = parse_job_description_file(job_path)
 
-    agent = AgentRH(llm=ollama_llm)
+    agent = AgentRH(llm=ollama_llm_cached)
     res = agent.analyser_offre_struct(jd["raw_text"], prefer_llm=True)
 
     out_path = Path("DATA/processed/jobs_parsed") / f"{jd['job_id']}_agent_llm.json"
-    out_path.write_text(json.dumps(res, ensure_ascii=False, indent=2), encoding="utf-8")
+    if orjson is not None:
+        out_path.write_bytes(orjson.dumps(res, option=orjson.OPT_INDENT_2))
+    else:
+        out_path.write_text(json.dumps(res, ensure_ascii=False, indent=2), encoding="utf-8")
     print(f"[OK] Résultat LLM écrit dans: {out_path}")
 
 
@@ -17,6 +17,12 @@ JOBS_PARSED_DIR = PROCESSED_DIR / "jobs_parsed"
 # RAG Configuration
 RAG_INDEX_DIR = PROCESSED_DIR / "rag_index"
 EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
+# Longueur de séquence max pour l'encodage : les documents candidats sont
+# tronqués à ~1800 caractères, 256 tokens suffisent et réduisent le padding
+EMBEDDING_MAX_SEQ_LENGTH = int(os.getenv("EMBEDDING_MAX_SEQ_LENGTH", "256"))
+# Backend d'inférence de l'encodeur : "torch" (défaut) ou "onnx"
+# (ONNX Runtime via optimum, ~4× plus rapide sur CPU)
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch")
 VECTOR_STORE_TYPE = os.getenv("VECTOR_STORE_TYPE", "chroma")  # chroma or faiss
 
 # LLM Configuration
@@ -24,6 +30,12 @@ OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
 LLM_MODEL = os.getenv("LLM_MODEL", "gpt-3.5-turbo")
 USE_LOCAL_LLM = os.getenv("USE_LOCAL_LLM", "false").lower() == "true"
 
+# Pipeline Parameters
+EVAL_MAX_WORKERS = int(os.getenv("EVAL_MAX_WORKERS", "8"))
+
+# UI Parameters
+TOP_K_DISPLAY = 10
+
 # Agent Scoring Weights (for Agent Décideur)
 WEIGHT_PROFIL = 0.3
 WEIGHT_TECHNIQUE = 0.4
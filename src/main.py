@@ -1,16 +1,46 @@
 """Point d'entrée : exécution du pipeline multi-agent."""
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# orjson (parseur Rust, 3-10× plus rapide) si disponible, json sinon ;
+# les deux exposent loads(bytes)
+try:
+    import orjson as _json
+except ImportError:
+    _json = json
+from functools import cached_property, lru_cache
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 
-from src.agents.agent_rh import AgentRH
-from src.agents.agent_profil import AgentProfil
-from src.agents.agent_technique import AgentTechnique
-from src.agents.agent_softskills import AgentSoftSkills
-from src.agents.agent_decideur import AgentDecideur
-from src.rag.query_index import RAGQueryEngine
+# Agents et moteur RAG importés paresseusement (dans __init__ et
+# initialize_rag) : importer src.main ne charge ni les agents ni
+# chromadb/sentence-transformers tant qu'aucun pipeline n'est construit
 from src.utils.data_utils import PARSED_DIR, extract_text
-from src.config import DATA_DIR
+from src.config import DATA_DIR, EVAL_MAX_WORKERS
+
+
+@lru_cache(maxsize=1)
+def _candidate_corpus() -> Dict[str, Dict]:
+    """Corpus des candidats parsés, chargé une fois par process.
+
+    Clé = nom de fichier sans extension (l'identifiant utilisé par le RAG).
+    Évite de rouvrir et re-parser chaque JSON à chaque offre traitée ; les
+    hits RAG sont ensuite servis par simple lookup dans ce dict, sans
+    toucher au disque. Appeler _candidate_corpus.cache_clear() après un
+    nouveau prétraitement.
+    """
+    corpus: Dict[str, Dict] = {}
+    if not PARSED_DIR.exists():
+        return corpus
+
+    for json_file in PARSED_DIR.glob("*.json"):
+        try:
+            corpus[json_file.stem] = _json.loads(json_file.read_bytes())
+        except Exception as e:
+            print(f"[ERROR] Erreur lors du chargement de {json_file}: {e}")
+
+    return corpus
 
 
 class MultiAgentPipeline:
@@ -22,26 +52,80 @@ class MultiAgentPipeline:
             llm: Modèle LLM optionnel pour tous les agents
         """
         self.llm = llm
-        
-        # Initialisation des agents
-        self.agent_rh = AgentRH(llm=llm)
-        self.agent_profil = AgentProfil(llm=llm)
-        self.agent_technique = AgentTechnique(llm=llm)
-        self.agent_softskills = AgentSoftSkills(llm=llm)
-        self.agent_decideur = AgentDecideur(llm=llm)
-        
+
+        # Les agents sont des cached_property : construits (et leur module
+        # importé) au premier accès seulement, puis réutilisés
+
         # RAG Query Engine
         self.rag_engine = None
+
+    @cached_property
+    def agent_rh(self):
+        from src.agents.agent_rh import AgentRH
+        return AgentRH(llm=self.llm)
+
+    @cached_property
+    def agent_profil(self):
+        from src.agents.agent_profil import AgentProfil
+        return AgentProfil(llm=self.llm)
+
+    @cached_property
+    def agent_technique(self):
+        from src.agents.agent_technique import AgentTechnique
+        return AgentTechnique(llm=self.llm)
+
+    @cached_property
+    def agent_softskills(self):
+        from src.agents.agent_softskills import AgentSoftSkills
+        return AgentSoftSkills(llm=self.llm)
+
+    @cached_property
+    def agent_decideur(self):
+        from src.agents.agent_decideur import AgentDecideur
+        return AgentDecideur(llm=self.llm)
     
     def initialize_rag(self):
         """Initialise le moteur RAG."""
         try:
+            from src.rag.query_index import RAGQueryEngine
+
             self.rag_engine = RAGQueryEngine()
             self.rag_engine.initialize()
             print("[OK] RAG initialisé")
         except Exception as e:
             print(f"[WARNING] RAG non disponible: {e}")
             self.rag_engine = None
+
+        # Pré-chauffage en arrière-plan : la première offre traitée ne paie
+        # ni la construction des agents, ni la compilation JIT des noyaux,
+        # ni le premier appel (froid) du moteur RAG
+        threading.Thread(target=self._warmup, daemon=True).start()
+
+    def _warmup(self):
+        """Chauffe agents, noyaux de scoring et RAG sur des entrées triviales."""
+        try:
+            import numpy as np
+            from src.utils.scoring_numba import (
+                technical_scores_from_presence,
+                weighted_global_scores,
+            )
+
+            # Déclenche la compilation Numba (no-op en repli NumPy)
+            weighted_global_scores(
+                np.zeros((1, 3), dtype=np.float32), np.zeros(3, dtype=np.float32)
+            )
+            technical_scores_from_presence(np.zeros((1, 1), dtype=bool))
+
+            # Construit les agents (cached_property) hors du chemin utilisateur
+            _ = (self.agent_rh, self.agent_profil, self.agent_technique,
+                 self.agent_softskills, self.agent_decideur)
+
+            if self.rag_engine:
+                self.rag_engine.query_by_job_profile(
+                    {"skills_obligatoires": ["python"]}, top_k=1
+                )
+        except Exception:
+            pass  # Le warm-up ne doit jamais faire échouer l'initialisation
     
     def process_job_offer(
         self,
@@ -81,13 +165,14 @@ class MultiAgentPipeline:
             rag_results = self.rag_engine.query_by_job_profile(job_profile, top_k=10)
             print(f"     {len(rag_results)} candidat(s) trouvé(s) via RAG")
             
-            # Charger les candidats depuis les fichiers parsés
-            for rag_result in rag_results:
-                candidate_id = rag_result["candidate_id"]
-                candidate_file = PARSED_DIR / f"{candidate_id}.json"
-                if candidate_file.exists():
-                    with open(candidate_file, 'r', encoding='utf-8') as f:
-                        candidates_to_evaluate.append(json.load(f))
+            # Résolution dans le corpus en mémoire (un seul chargement par
+            # process) au lieu d'une ouverture de fichier par hit RAG
+            corpus = _candidate_corpus()
+            candidates_to_evaluate = [
+                corpus[rag_result["candidate_id"]]
+                for rag_result in rag_results
+                if rag_result["candidate_id"] in corpus
+            ]
         else:
             # Fallback: charger tous les candidats
             print("\n[2/5] Chargement de tous les candidats (RAG désactivé)...")
@@ -102,15 +187,26 @@ class MultiAgentPipeline:
                 "report": {"error": "Aucun candidat trouvé"}
             }
         
-        # Étape 3-5: Évaluation de chaque candidat
-        print(f"\n[3-5/5] Évaluation de {len(candidates_to_evaluate)} candidat(s)...")
-        evaluations = []
-        
-        for i, candidate in enumerate(candidates_to_evaluate, 1):
-            print(f"\n  Candidat {i}/{len(candidates_to_evaluate)}: {candidate.get('id', 'N/A')}")
-            
-            evaluation = self._evaluate_candidate(candidate, job_profile)
-            evaluations.append(evaluation)
+        # Étape 3-5: Évaluation de chaque candidat. Les évaluations sont
+        # indépendantes et dominées par la latence LLM/embedding : elles
+        # tournent dans un pool de threads, ex.map préservant l'ordre
+        print(f"\n[3-5/5] Évaluation de {len(candidates_to_evaluate)} candidat(s) "
+              f"({EVAL_MAX_WORKERS} workers)...")
+        # Représentation côté offre extraite une seule fois hors de la
+        # boucle candidats (les agents n'ont plus qu'à la consommer)
+        required_skills = job_profile.get("skills_obligatoires", [])
+        optional_skills = job_profile.get("skills_optionnelles", [])
+        mots_cles = job_profile.get("mots_cles", [])
+        with ThreadPoolExecutor(max_workers=EVAL_MAX_WORKERS) as executor:
+            evaluations = list(executor.map(
+                lambda candidate: self._evaluate_candidate(
+                    candidate, job_profile,
+                    required_skills=required_skills,
+                    optional_skills=optional_skills,
+                    mots_cles=mots_cles
+                ),
+                candidates_to_evaluate
+            ))
         
         # Étape 6: Agent Décideur - Classement final
         print("\n[6/6] Agent Décideur: Classement final...")
@@ -125,9 +221,9 @@ class MultiAgentPipeline:
         print("="*60)
         print(f"\nTop 3 candidats:")
         for i, cand in enumerate(evaluations_classees[:3], 1):
-            print(f"  {i}. {cand.get('candidate_id', 'N/A')} - "
-                  f"Score: {cand.get('score_global', 0):.1f}/100 - "
-                  f"{cand.get('recommandation', 'N/A')}")
+            print(f"  {i}. {cand.candidate_id} - "
+                  f"Score: {cand.score_global:.1f}/100 - "
+                  f"{cand.recommandation}")
         
         return {
             "job_profile": job_profile,
@@ -138,15 +234,31 @@ class MultiAgentPipeline:
     def _evaluate_candidate(
         self,
         candidate: Dict,
-        job_profile: Dict
-    ) -> Dict[str, Any]:
-        """Évalue un candidat avec tous les agents."""
-        
-        candidate_id = candidate.get("id", "unknown")
-        cv_text = candidate.get("raw_text", "")
-        lettre_motivation = candidate.get("lettre_motivation", "")
-        experience_text = candidate.get("experience_text", "")
-        skills_list = candidate.get("skills_list", [])
+        job_profile: Dict,
+        required_skills: Optional[List[str]] = None,
+        optional_skills: Optional[List[str]] = None,
+        mots_cles: Optional[List[str]] = None
+    ) -> "DecisionResult":
+        """Évalue un candidat avec tous les agents.
+
+        Les champs côté offre (required_skills, optional_skills, mots_cles)
+        peuvent être fournis par l'appelant pour éviter de les re-extraire
+        de job_profile à chaque candidat ; sinon ils en sont dérivés.
+        """
+        if required_skills is None:
+            required_skills = job_profile.get("skills_obligatoires", [])
+        if optional_skills is None:
+            optional_skills = job_profile.get("skills_optionnelles", [])
+        if mots_cles is None:
+            mots_cles = job_profile.get("mots_cles", [])
+
+        # Liaison locale : un seul lookup d'attribut au lieu d'un par champ
+        get = candidate.get
+        candidate_id = get("id", "unknown")
+        cv_text = get("raw_text", "")
+        lettre_motivation = get("lettre_motivation", "")
+        experience_text = get("experience_text", "")
+        skills_list = get("skills_list", [])
         
         # Agent Profil
         profil_result = self.agent_profil.analyser_profil(
@@ -158,8 +270,8 @@ class MultiAgentPipeline:
         # Agent Technique
         technique_result = self.agent_technique.evaluer_technique(
             skills_list,
-            job_profile.get("skills_obligatoires", []),
-            job_profile.get("skills_optionnelles", []),
+            required_skills,
+            optional_skills,
             experience_text
         )
         
@@ -168,7 +280,7 @@ class MultiAgentPipeline:
             lettre_motivation,
             experience_text,
             cv_text,
-            job_profile.get("mots_cles", [])
+            mots_cles
         )
         
         # Agent Décideur
@@ -187,23 +299,8 @@ class MultiAgentPipeline:
         return decision
     
     def _load_all_candidates(self) -> List[Dict]:
-        """Charge tous les candidats depuis les fichiers parsés."""
-        candidates = []
-        
-        if not PARSED_DIR.exists():
-            return candidates
-        
-        json_files = list(PARSED_DIR.glob("*.json"))
-        
-        for json_file in json_files:
-            try:
-                with open(json_file, 'r', encoding='utf-8') as f:
-                    candidate = json.load(f)
-                    candidates.append(candidate)
-            except Exception as e:
-                print(f"[ERROR] Erreur lors du chargement de {json_file}: {e}")
-        
-        return candidates
+        """Charge tous les candidats depuis le corpus en mémoire."""
+        return list(_candidate_corpus().values())
 
 
 def main():
@@ -0,0 +1,91 @@
+"""Chargement partagé du modèle d'embeddings (un seul exemplaire par process)."""
+from functools import lru_cache
+
+import numpy as np
+from sentence_transformers import SentenceTransformer
+
+from src.config import EMBEDDING_BACKEND, EMBEDDING_MAX_SEQ_LENGTH
+
+
+class ONNXEncoder:
+    """
+    Encodeur compatible encode() exécuté sur ONNX Runtime
+    (EMBEDDING_BACKEND=onnx) : ~4× plus rapide que le chemin PyTorch sur
+    CPU, là où la passe avant d'embedding domine le temps total. Le modèle
+    est exporté en ONNX au premier chargement via optimum, puis pooling
+    moyen + normalisation sont faits en NumPy.
+    """
+
+    def __init__(self, model_name: str):
+        from optimum.onnxruntime import ORTModelForFeatureExtraction
+        from transformers import AutoTokenizer
+
+        self.max_seq_length = EMBEDDING_MAX_SEQ_LENGTH
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+        self.model = ORTModelForFeatureExtraction.from_pretrained(
+            model_name, export=True, provider="CPUExecutionProvider"
+        )
+
+    def encode(self, texts, batch_size: int = 64, **kwargs) -> np.ndarray:
+        """Signature alignée sur SentenceTransformer.encode (sous-ensemble)."""
+        single = isinstance(texts, str)
+        if single:
+            texts = [texts]
+
+        chunks = []
+        for start in range(0, len(texts), batch_size):
+            toks = self.tokenizer(
+                texts[start:start + batch_size],
+                padding=True,
+                truncation=True,
+                max_length=self.max_seq_length,
+                return_tensors="np"
+            )
+            hidden = np.asarray(
+                self.model(**toks).last_hidden_state, dtype=np.float32
+            )
+            # Pooling moyen masqué, comme la tête de pooling SBERT
+            mask = toks["attention_mask"][..., None].astype(np.float32)
+            chunks.append(
+                (hidden * mask).sum(axis=1) / np.maximum(mask.sum(axis=1), 1e-9)
+            )
+
+        embeddings = np.concatenate(chunks, axis=0)
+        if kwargs.get("normalize_embeddings", True):
+            embeddings /= np.maximum(
+                np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12
+            )
+        return embeddings[0] if single else embeddings
+
+
+def half_precision_if_gpu(model: SentenceTransformer) -> SentenceTransformer:
+    """
+    Passe l'encodeur en FP16 quand il tourne sur CUDA : moitié moins de
+    bande passante mémoire et débit ALU doublé, pour une dérive sémantique
+    négligeable sur les modèles d'embeddings. Sur CPU le FP32 est conservé —
+    sans AVX512-BF16/AMX la demi-précision y est émulée, donc plus lente.
+    """
+    import torch
+
+    if torch.cuda.is_available():
+        model = model.half()
+        print("[INFO] Encodeur converti en FP16 (CUDA)")
+    return model
+
+
+@lru_cache(maxsize=4)
+def get_embedding_model(name: str):
+    """
+    Charge l'encodeur selon EMBEDDING_BACKEND (torch par défaut, onnx).
+
+    Mémoïsé par nom de modèle : un script qui construit l'index puis
+    requête dans le même process (CLI, warm-up du pipeline) ne charge le
+    modèle (~400 Mo) qu'une seule fois.
+    """
+    if EMBEDDING_BACKEND == "onnx":
+        return ONNXEncoder(name)
+    model = SentenceTransformer(name)
+    # Borne serrée : évite de padder chaque mini-batch jusqu'à la limite
+    # du modèle alors que nos documents tronqués tiennent en 256 tokens
+    model.max_seq_length = EMBEDDING_MAX_SEQ_LENGTH
+    return half_precision_if_gpu(model)
@@ -1,13 +1,26 @@
 """Création de l'index vectoriel pour les documents candidats."""
+import hashlib
 import json
+import sqlite3
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 
-from sentence_transformers import SentenceTransformer
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+import numpy as np
 import chromadb
 from chromadb.config import Settings
 
-from src.config import RAG_INDEX_DIR, EMBEDDING_MODEL, VECTOR_STORE_TYPE
+from src.config import (
+    RAG_INDEX_DIR,
+    EMBEDDING_MODEL,
+    EMBEDDING_MAX_SEQ_LENGTH,
+    VECTOR_STORE_TYPE,
+)
+from src.rag._model import get_embedding_model
 from src.utils.data_utils import PARSED_DIR, list_raw_files, parse_raw_file
 
 
@@ -29,8 +42,10 @@ class RAGIndexBuilder:
     def initialize(self):
         """Initialise le modèle d'embeddings et le vector store."""
         print(f"[INFO] Chargement du modèle d'embeddings: {self.embedding_model_name}")
-        self.embedding_model = SentenceTransformer(self.embedding_model_name)
-        
+        # Singleton par process : un script qui indexe puis requête ne
+        # charge le modèle (~400 Mo) qu'une seule fois
+        self.embedding_model = get_embedding_model(self.embedding_model_name)
+
         if self.vector_store_type == "chroma":
             RAG_INDEX_DIR.mkdir(parents=True, exist_ok=True)
             self.client = chromadb.PersistentClient(
@@ -42,6 +57,11 @@ class RAGIndexBuilder:
                 metadata={"hnsw:space": "cosine"}
             )
             print("[INFO] Index ChromaDB initialisé")
+        elif self.vector_store_type == "faiss":
+            import faiss  # noqa: F401 — échec immédiat si FAISS est absent
+
+            RAG_INDEX_DIR.mkdir(parents=True, exist_ok=True)
+            print("[INFO] Vector store FAISS HNSW prêt")
         else:
             raise ValueError(f"Vector store type non supporté: {self.vector_store_type}")
     
@@ -73,12 +93,7 @@ class RAGIndexBuilder:
         
         for candidate in candidates:
             # Création du document texte pour embedding
-            doc_text = self._create_document_text(candidate)
-            
-            # Embedding
-            embedding = self.embedding_model.encode(doc_text).tolist()
-            
-            documents.append(doc_text)
+            documents.append(self._create_document_text(candidate))
             metadatas.append({
                 "candidate_id": candidate.get("id", ""),
                 "email": candidate.get("email", ""),
@@ -86,18 +101,137 @@ class RAGIndexBuilder:
                 "years_experience": str(candidate.get("years_experience", 0)),
             })
             ids.append(candidate.get("id", f"cand_{len(ids)}"))
-        
-        # Ajout à ChromaDB
+
+        # Encodage par lot, avec cache disque : seuls les documents dont le
+        # texte a changé depuis la dernière indexation passent au transformer
+        embeddings = self._encode_with_cache(documents)
+
+        # Ajout à ChromaDB (vecteurs précalculés : Chroma ne ré-encode pas).
+        # Le tableau NumPy est passé tel quel : .tolist() boxerait chaque
+        # float en objet Python (~24 octets pièce) pour que Chroma
+        # reconvertisse aussitôt en array
         if self.vector_store_type == "chroma":
             self.collection.add(
                 documents=documents,
+                embeddings=embeddings,
                 metadatas=metadatas,
                 ids=ids
             )
             print(f"[OK] {len(documents)} document(s) indexé(s)")
-        
+        elif self.vector_store_type == "faiss":
+            import faiss
+
+            # Graphe HNSW avec distances SIMD : M=16 voisins par nœud,
+            # produit scalaire comme métrique (vecteurs normalisés = cosinus)
+            xb = np.ascontiguousarray(embeddings, dtype=np.float32)
+            index = faiss.IndexHNSWFlat(xb.shape[1], 16, faiss.METRIC_INNER_PRODUCT)
+            index.hnsw.efConstruction = 64
+            index.add(xb)
+            faiss.write_index(index, str(RAG_INDEX_DIR / "hnsw.faiss"))
+            # Documents et métadonnées persistés à part (pas de collection
+            # Chroma pour les servir à la requête)
+            with open(RAG_INDEX_DIR / "fiches.json", "w", encoding="utf-8") as f:
+                json.dump(
+                    {
+                        cid: {"document": doc, "metadata": meta}
+                        for cid, doc, meta in zip(ids, documents, metadatas)
+                    },
+                    f,
+                    ensure_ascii=False
+                )
+            print(f"[OK] {len(documents)} document(s) indexé(s) (FAISS HNSW)")
+
+        # Sidecar quantifié pour le chemin de requête rapide
+        self._write_quantized_sidecar(np.asarray(embeddings, dtype=np.float32), ids)
+
         return len(documents)
+
+    def _write_quantized_sidecar(self, embeddings: np.ndarray, ids: List[str]):
+        """
+        Écrit le sidecar de recherche rapide : vecteurs quantifiés int8 +
+        copies FP16 pour le rerank.
+
+        Quantification scalaire par dimension : x_q = round((x - shift) / alpha)
+        avec shift = min et alpha = (max - min) / 255 calculés sur le lot.
+        Le scan de requête travaille alors sur 4× moins d'octets que le FP32,
+        la précision étant récupérée par un rerank FP32 sur la shortlist
+        (voir RAGQueryEngine).
+        """
+        emb_min = embeddings.min(axis=0)
+        alpha = (embeddings.max(axis=0) - emb_min) / 255.0
+        alpha[alpha == 0] = 1.0  # Dimension constante : évite la division par 0
+        quantized = np.clip(
+            np.round((embeddings - emb_min) / alpha), 0, 255
+        ).astype(np.uint8)
+
+        np.save(RAG_INDEX_DIR / "emb_int8.npy", quantized)
+        np.save(RAG_INDEX_DIR / "emb_fp16.npy", embeddings.astype(np.float16))
+        # Quantification binaire (signe de chaque dimension, 1 bit/dim) :
+        # 32× plus compact que le FP32, filtré par distance de Hamming côté
+        # requête quand precision="binary"
+        np.save(RAG_INDEX_DIR / "emb_bits.npy", np.packbits(embeddings > 0, axis=1))
+        np.save(RAG_INDEX_DIR / "quant_alpha.npy", alpha.astype(np.float32))
+        np.save(RAG_INDEX_DIR / "quant_shift.npy", emb_min.astype(np.float32))
+        with open(RAG_INDEX_DIR / "ids.json", "w", encoding="utf-8") as f:
+            json.dump(ids, f, ensure_ascii=False)
+        print(f"[INFO] Sidecar quantifié écrit ({len(ids)} vecteur(s) int8 + FP16)")
     
+    def _encode_with_cache(self, documents: List[str]) -> np.ndarray:
+        """
+        Encode les documents en réutilisant un cache disque d'embeddings.
+
+        Chaque vecteur est indexé par le SHA-256 du texte de son document
+        dans RAG_INDEX_DIR/emb_cache.db : lors d'un rebuild où les CV n'ont
+        pas changé, l'inférence transformer est remplacée par de simples
+        lookups SQLite, seuls les documents modifiés étant ré-encodés.
+        """
+        RAG_INDEX_DIR.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(RAG_INDEX_DIR / "emb_cache.db")
+        try:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS emb_cache (hash TEXT PRIMARY KEY, vec BLOB)"
+            )
+
+            hashes = [
+                hashlib.sha256(doc.encode("utf-8")).hexdigest() for doc in documents
+            ]
+            embeddings: List[Optional[np.ndarray]] = [None] * len(documents)
+            miss_idx = []
+            for i, h in enumerate(hashes):
+                row = conn.execute(
+                    "SELECT vec FROM emb_cache WHERE hash=?", (h,)
+                ).fetchone()
+                if row:
+                    embeddings[i] = np.frombuffer(row[0], dtype=np.float32)
+                else:
+                    miss_idx.append(i)
+
+            if miss_idx:
+                # Un seul encode par lot pour l'ensemble des absents
+                nouveaux = self.embedding_model.encode(
+                    [documents[i] for i in miss_idx],
+                    batch_size=64,
+                    convert_to_numpy=True,
+                    normalize_embeddings=True,
+                    show_progress_bar=False
+                ).astype(np.float32)
+                conn.executemany(
+                    "INSERT OR REPLACE INTO emb_cache VALUES (?, ?)",
+                    [
+                        (hashes[i], nouveaux[k].tobytes())
+                        for k, i in enumerate(miss_idx)
+                    ]
+                )
+                conn.commit()
+                for k, i in enumerate(miss_idx):
+                    embeddings[i] = nouveaux[k]
+
+            print(f"[INFO] Embeddings: {len(documents) - len(miss_idx)} depuis le "
+                  f"cache, {len(miss_idx)} encodé(s)")
+            return np.stack(embeddings)
+        finally:
+            conn.close()
+
     def _create_document_text(self, candidate: Dict) -> str:
         """Crée un texte de document à partir d'un candidat."""
         parts = []
@@ -121,24 +255,40 @@ class RAGIndexBuilder:
         raw_text = candidate.get("raw_text", "")
         if raw_text:
             parts.append(raw_text[:1000])
-        
-        return "\n\n".join(parts)
+
+        # Tronqué AVANT la tokenisation : au-delà de max_seq_length le
+        # modèle coupe de toute façon, mais le tokenizer parcourrait quand
+        # même tout le texte (~3 caractères par token en pratique)
+        return "\n\n".join(parts)[:EMBEDDING_MAX_SEQ_LENGTH * 3]
     
     def _load_candidates_from_files(self) -> List[Dict]:
-        """Charge les candidats depuis les fichiers JSON parsés."""
+        """Charge les candidats depuis le corpus consolidé ou les JSON parsés."""
         candidates = []
-        
+        loads = orjson.loads if orjson is not None else json.loads
+
+        # Corpus consolidé (écrit par preprocess_all_raw) : une seule
+        # lecture séquentielle au lieu d'un open + décodage par fichier
+        jsonl_path = PARSED_DIR.parent / "candidates.jsonl"
+        if jsonl_path.exists():
+            try:
+                return [
+                    loads(line)
+                    for line in jsonl_path.read_bytes().splitlines()
+                    if line
+                ]
+            except Exception as e:
+                print(f"[ERROR] Erreur lors du chargement de {jsonl_path}: {e}")
+                candidates = []
+
         if not PARSED_DIR.exists():
             print(f"[WARNING] Dossier {PARSED_DIR} n'existe pas")
             return candidates
-        
+
         json_files = list(PARSED_DIR.glob("*.json"))
-        
+
         for json_file in json_files:
             try:
-                with open(json_file, 'r', encoding='utf-8') as f:
-                    candidate = json.load(f)
-                    candidates.append(candidate)
+                candidates.append(loads(json_file.read_bytes()))
             except Exception as e:
                 print(f"[ERROR] Erreur lors du chargement de {json_file}: {e}")
         
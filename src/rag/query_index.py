@@ -1,33 +1,71 @@
 """Requêtes sur l'index pour trouver les candidats proches d'une offre."""
+import json
 from typing import List, Dict, Any, Optional
 
-from sentence_transformers import SentenceTransformer
+import numpy as np
 import chromadb
 
-from src.config import RAG_INDEX_DIR, EMBEDDING_MODEL, VECTOR_STORE_TYPE, TOP_K_CANDIDATES
+from src.config import (
+    RAG_INDEX_DIR,
+    EMBEDDING_MODEL,
+    VECTOR_STORE_TYPE,
+    TOP_K_CANDIDATES,
+)
+from src.rag._model import get_embedding_model
 from src.rag.build_index import RAGIndexBuilder
 
 
+# Table de popcount par octet : la distance de Hamming entre vecteurs
+# packés se calcule par indexation vectorisée, sans unpackbits
+_POPCOUNT = np.unpackbits(
+    np.arange(256, dtype=np.uint8)[:, None], axis=1
+).sum(axis=1).astype(np.uint8)
+
+
 class RAGQueryEngine:
     """Moteur de requêtes RAG pour trouver des candidats pertinents."""
-    
-    def __init__(self, embedding_model: str = None, vector_store_type: str = None):
+
+    def __init__(
+        self,
+        embedding_model: str = None,
+        vector_store_type: str = None,
+        precision: str = "int8"
+    ):
         """
         Args:
             embedding_model: Nom du modèle d'embeddings
             vector_store_type: Type de vector store
+            precision: Quantification du filtre initial sur le sidecar —
+                "int8" (produits scalaires entiers) ou "binary" (distance
+                de Hamming sur 1 bit/dimension, 32× plus compact, pour les
+                gros corpus). Le rerank FP32 est identique dans les deux cas.
         """
         self.embedding_model_name = embedding_model or EMBEDDING_MODEL
         self.vector_store_type = vector_store_type or VECTOR_STORE_TYPE
+        self.precision = precision
         self.embedding_model = None
         self.client = None
         self.collection = None
-    
+        # Sidecar quantifié (écrit par RAGIndexBuilder) : scan int8 +
+        # rerank FP32 sans passer par le chemin de requête Chroma
+        self._q_int8 = None
+        self._q_fp16 = None
+        self._q_alpha = None
+        self._q_shift = None
+        self._q_bits = None
+        self._q_ids = None
+        # Index FAISS HNSW (vector_store_type == "faiss")
+        self._faiss_index = None
+        self._faiss_ids = None
+        self._fiches = {}
+
     def initialize(self):
         """Initialise le modèle et la connexion au vector store."""
         if not self.embedding_model:
             print(f"[INFO] Chargement du modèle d'embeddings: {self.embedding_model_name}")
-            self.embedding_model = SentenceTransformer(self.embedding_model_name)
+            # Même backend, borne de séquence et précision que côté
+            # indexation ; instance partagée par process via le singleton
+            self.embedding_model = get_embedding_model(self.embedding_model_name)
         
         if self.vector_store_type == "chroma":
             if not RAG_INDEX_DIR.exists():
@@ -42,6 +80,43 @@ class RAGQueryEngine:
                 metadata={"hnsw:space": "cosine"}
             )
             print("[INFO] Connexion à l'index ChromaDB établie")
+        elif self.vector_store_type == "faiss":
+            import faiss
+
+            index_path = RAG_INDEX_DIR / "hnsw.faiss"
+            if not index_path.exists():
+                raise ValueError(
+                    f"Index FAISS non trouvé dans {RAG_INDEX_DIR}. "
+                    "Exécutez build_index.py d'abord."
+                )
+            # Index chargé une seule fois ; efSearch gouverne le compromis
+            # rappel/latence de la traversée HNSW
+            self._faiss_index = faiss.read_index(str(index_path))
+            self._faiss_index.hnsw.efSearch = 100
+            with open(RAG_INDEX_DIR / "ids.json", encoding="utf-8") as f:
+                self._faiss_ids = json.load(f)
+            with open(RAG_INDEX_DIR / "fiches.json", encoding="utf-8") as f:
+                self._fiches = json.load(f)
+            print("[INFO] Index FAISS HNSW chargé")
+
+        self._load_quantized_sidecar()
+
+    def _load_quantized_sidecar(self):
+        """Charge le sidecar int8/FP16 s'il a été écrit par le builder."""
+        try:
+            self._q_int8 = np.load(RAG_INDEX_DIR / "emb_int8.npy")
+            self._q_fp16 = np.load(RAG_INDEX_DIR / "emb_fp16.npy")
+            self._q_alpha = np.load(RAG_INDEX_DIR / "quant_alpha.npy")
+            self._q_shift = np.load(RAG_INDEX_DIR / "quant_shift.npy")
+            with open(RAG_INDEX_DIR / "ids.json", encoding="utf-8") as f:
+                self._q_ids = json.load(f)
+            try:
+                self._q_bits = np.load(RAG_INDEX_DIR / "emb_bits.npy")
+            except (FileNotFoundError, OSError):
+                self._q_bits = None  # Sidecar d'avant la quantification binaire
+            print(f"[INFO] Sidecar quantifié chargé ({len(self._q_ids)} vecteur(s))")
+        except (FileNotFoundError, OSError):
+            self._q_int8 = None  # Index construit avant le sidecar : chemin Chroma
     
     def query(
         self,
@@ -68,14 +143,30 @@ class RAGQueryEngine:
             self.initialize()
         
         top_k = top_k or TOP_K_CANDIDATES
-        
-        # Embedding de la requête
-        query_embedding = self.embedding_model.encode(query_text).tolist()
-        
+
+        # Chemin FAISS : traversée HNSW avec noyaux de distance SIMD
+        if self._faiss_index is not None:
+            if filter_metadata is not None:
+                raise ValueError(
+                    "Filtres métadonnées non supportés avec le store FAISS"
+                )
+            return self._query_faiss(query_text, top_k)
+
+        # Chemin rapide : scan int8 + rerank FP32 sur le sidecar (les
+        # filtres métadonnées restent du ressort de Chroma)
+        if self._q_int8 is not None and filter_metadata is None:
+            return self._query_quantized(query_text, top_k)
+
+        # Embedding de la requête, gardé en NumPy de bout en bout
+        query_embedding = np.asarray(
+            self.embedding_model.encode(query_text, convert_to_numpy=True),
+            dtype=np.float32
+        )
+
         # Recherche dans ChromaDB
         if self.vector_store_type == "chroma":
             results = self.collection.query(
-                query_embeddings=[query_embedding],
+                query_embeddings=query_embedding.reshape(1, -1),
                 n_results=top_k,
                 where=filter_metadata,
                 include=["documents", "metadatas", "distances"]
@@ -100,9 +191,97 @@ class RAGQueryEngine:
                     })
             
             return candidates
-        
+
         return []
-    
+
+    def _query_faiss(self, query_text: str, top_k: int) -> List[Dict[str, Any]]:
+        """Recherche top-k via l'index FAISS HNSW chargé à l'initialisation."""
+        q_emb = np.asarray(
+            self.embedding_model.encode(query_text, normalize_embeddings=True),
+            dtype=np.float32
+        ).reshape(1, -1)
+
+        scores, indices = self._faiss_index.search(q_emb, top_k)
+
+        candidates = []
+        for score, idx in zip(scores[0], indices[0]):
+            if idx < 0:  # FAISS remplit avec -1 quand l'index a moins de k vecteurs
+                continue
+            candidate_id = self._faiss_ids[idx]
+            fiche = self._fiches.get(candidate_id, {})
+            candidates.append({
+                "candidate_id": candidate_id,
+                "score": float(score),
+                "distance": float(1 - score),
+                "document": fiche.get("document", ""),
+                "metadata": fiche.get("metadata", {})
+            })
+        return candidates
+
+    def _query_quantized(self, query_text: str, top_k: int) -> List[Dict[str, Any]]:
+        """
+        Recherche via le sidecar : shortlist top 4·k par un filtre quantifié
+        (produits scalaires int8, ou distance de Hamming sur les signes si
+        precision="binary"), puis rerank cosinus FP32 de la shortlist depuis
+        les copies FP16. La perte de rappel de la quantification est
+        récupérée par le rerank.
+        """
+        q_emb = np.asarray(
+            self.embedding_model.encode(query_text, normalize_embeddings=True),
+            dtype=np.float32
+        )
+
+        if self.precision == "binary" and self._q_bits is not None:
+            # Filtre Hamming : xor des vecteurs packés puis popcount par
+            # table ; score négatif pour garder "plus grand = meilleur"
+            q_bits = np.packbits(q_emb > 0)
+            approx = -_POPCOUNT[self._q_bits ^ q_bits].sum(axis=1).astype(np.int32)
+        else:
+            # Quantification de la requête avec les paramètres de l'index,
+            # puis produits scalaires entiers (cast int32 pour éviter le
+            # débordement du produit uint8)
+            q_quant = np.clip(
+                np.round((q_emb - self._q_shift) / self._q_alpha), 0, 255
+            ).astype(np.uint8)
+            approx = self._q_int8.astype(np.int32) @ q_quant.astype(np.int32)
+
+        n = approx.shape[0]
+        shortlist_size = min(4 * top_k, n)
+        if shortlist_size < n:
+            shortlist = np.argpartition(-approx, shortlist_size)[:shortlist_size]
+        else:
+            shortlist = np.arange(n)
+
+        # Rerank exact : les vecteurs sont normalisés à l'indexation, le
+        # produit scalaire est donc le cosinus
+        sims = self._q_fp16[shortlist].astype(np.float32) @ q_emb
+        order = shortlist[np.argsort(-sims, kind="stable")[:top_k]]
+        scores = self._q_fp16[order].astype(np.float32) @ q_emb
+
+        # Documents et métadonnées récupérés en un seul get Chroma
+        hit_ids = [self._q_ids[i] for i in order]
+        fiches = {}
+        if self.collection is not None:
+            res = self.collection.get(ids=hit_ids, include=["documents", "metadatas"])
+            fiches = {
+                cid: (doc, meta)
+                for cid, doc, meta in zip(
+                    res["ids"], res["documents"], res["metadatas"]
+                )
+            }
+
+        candidates = []
+        for cid, score in zip(hit_ids, scores):
+            document, metadata = fiches.get(cid, ("", {}))
+            candidates.append({
+                "candidate_id": cid,
+                "score": float(score),
+                "distance": float(1 - score),
+                "document": document,
+                "metadata": metadata
+            })
+        return candidates
+
     def query_by_job_profile(self, job_profile: Dict, top_k: int = None) -> List[Dict[str, Any]]:
         """
         Recherche des candidats pertinents pour un profil de poste.
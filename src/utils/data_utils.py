@@ -1,9 +1,18 @@
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import List, Dict
 import json
+import os
 import re
 import csv
 
+# Encodeur JSON Rust (SIMD, écrit l'UTF-8 directement) si disponible
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from src.utils.parsing import parse_cv_text
 
 # 📌 Chemins du projet
@@ -44,13 +53,24 @@ def extract_text(path: Path) -> str:
 
 
 def clean_text(text: str) -> str:
-    text = text.replace("\r", " ")
-    text = re.sub(r"\s+", " ", text)
-    return text.strip()
+    # Une seule passe C : split() sans argument fusionne toutes les suites
+    # d'espaces Unicode (dont \r) et strip les bords, là où l'enchaînement
+    # replace + re.sub + strip parcourait le texte trois fois
+    return " ".join(text.split())
+
+
+# Table de translation : tout codepoint hors [a-z0-9_] devient "_" (le
+# defaultdict couvre aussi les accents et l'Unicode au-delà de l'ASCII),
+# puis une petite regex replie les suites de "_" — str.translate tourne
+# en C, sans moteur regex sur le gros du travail
+_ID_TBL = defaultdict(
+    lambda: "_", {ord(c): c for c in "abcdefghijklmnopqrstuvwxyz0123456789_"}
+)
+_ID_RUN_RE = re.compile(r"_+")
 
 
 def build_candidate_id(path: Path) -> str:
-    return re.sub(r"[^a-z0-9_]+", "_", path.stem.lower()).strip("_")
+    return _ID_RUN_RE.sub("_", path.stem.lower().translate(_ID_TBL)).strip("_")
 
 
 def parse_raw_file(path: Path) -> Dict:
@@ -78,14 +98,35 @@ def parse_raw_file(path: Path) -> Dict:
     return base
 
 
-
-
 def save_candidate_json(cand: Dict) -> Path:
     out = PARSED_DIR / f"{cand['id']}.json"
-    out.write_text(json.dumps(cand, ensure_ascii=False, indent=2), encoding="utf-8")
+    if orjson is not None:
+        out.write_bytes(orjson.dumps(cand, option=orjson.OPT_INDENT_2))
+    else:
+        # Encodage incrémental vers le fichier : évite de matérialiser la
+        # str complète (raw_text compris) puis son encodage UTF-8 en mémoire
+        with out.open("w", encoding="utf-8", buffering=1 << 16) as f:
+            json.dump(cand, f, ensure_ascii=False, indent=2)
     return out
 
 
+def save_candidates_jsonl(candidates: List[Dict]) -> Path:
+    """
+    Consolide tous les candidats dans un seul fichier JSONL (un objet par
+    ligne). Les lecteurs de corpus (builder RAG) font alors une seule
+    lecture séquentielle au lieu d'un open + décodage par fichier.
+    """
+    jsonl_path = PROCESSED_DIR / "candidates.jsonl"
+    dumps = (lambda c: orjson.dumps(c)) if orjson is not None else (
+        lambda c: json.dumps(c, ensure_ascii=False).encode("utf-8")
+    )
+    with jsonl_path.open("wb") as f:
+        for cand in candidates:
+            f.write(dumps(cand))
+            f.write(b"\n")
+    return jsonl_path
+
+
 def save_candidates_csv(candidates: List[Dict]) -> Path:
     """
     Sauvegarde un CSV simple avec les infos de base des candidats + quelques champs utiles.
@@ -126,15 +167,18 @@ def preprocess_all_raw() -> List[Dict]:
 
     print(f"[INFO] {len(files)} fichier(s) trouvé(s).")
 
-    cands: List[Dict] = []
+    # Extraction PDF + parsing en parallèle sur tous les cœurs (travail
+    # CPU-bound, indépendant par fichier) ; les écritures JSON restent
+    # séquentielles sur le process principal
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        cands = list(executor.map(parse_raw_file, files, chunksize=4))
 
-    for p in files:
-        cand = parse_raw_file(p)
+    for p, cand in zip(files, cands):
         save_candidate_json(cand)
-        cands.append(cand)
         print(f"[OK] {p.name} → {cand['id']}")
 
     save_candidates_csv(cands)
+    save_candidates_jsonl(cands)
     print("[INFO] CSV généré 👍")
     print(f"[INFO] JSON générés dans : {PARSED_DIR}")
 
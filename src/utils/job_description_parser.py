@@ -7,8 +7,15 @@ from __future__ import annotations
 
 import csv
 import json
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 from typing import Any, Dict, List
 
 from src.utils.data_utils import (
@@ -59,22 +66,37 @@ SECTION_TOKENS = {
 }
 
 
+# Union compilée une fois à l'import : une seule passe sur le texte au lieu
+# d'un re.sub par token (~25 passes). Tokens triés du plus long au plus
+# court pour que l'alternance matche "competences techniques" avant
+# "competences".
+_ALL_TOKENS = sorted(
+    (tok for tokens in SECTION_TOKENS.values() for tok in tokens),
+    key=len,
+    reverse=True,
+)
+_HEADING_RE = re.compile(
+    r"(?i)\b(" + "|".join(re.escape(tok) for tok in _ALL_TOKENS) + r")\b"
+)
+
+# Lookup token -> nom de section, avec un motif ancré pour les préfixes
+# multi-mots : remplace la double boucle sections × tokens en startswith
+_SECTION_LOOKUP = {
+    tok.lower(): name for name, tokens in SECTION_TOKENS.items() for tok in tokens
+}
+_SECTION_PREFIX_RE = re.compile(
+    "(" + "|".join(re.escape(tok) for tok in _ALL_TOKENS) + ")"
+)
+
+
 def _inject_newlines_for_headings(text: str) -> str:
-    updated = text
-    for tokens in SECTION_TOKENS.values():
-        for token in tokens:
-            pattern = rf"(?i)\b({re.escape(token)})\b"
-            updated = re.sub(pattern, r"\n\1\n", updated)
-    return updated
+    return _HEADING_RE.sub(r"\n\1\n", text)
 
 
 def _detect_section_name(line: str) -> str | None:
     norm = line.lower().strip(" :-\t")
-    for name, tokens in SECTION_TOKENS.items():
-        for tok in tokens:
-            if norm.startswith(tok.lower()):
-                return name
-    return None
+    m = _SECTION_PREFIX_RE.match(norm)
+    return _SECTION_LOOKUP[m.group(1)] if m else None
 
 
 def _split_sections(text: str) -> Dict[str, str]:
@@ -96,15 +118,41 @@ def _split_sections(text: str) -> Dict[str, str]:
     return {k: "\n".join(v).strip() for k, v in sections.items()}
 
 
-def _extract_numbers(desc: str, patterns: List[str]) -> List[int]:
-    nums = []
-    for pat in patterns:
-        for m in re.finditer(pat, desc):
-            try:
-                nums.append(int(m.group(1)))
-            except ValueError:
-                continue
-    return nums
+# Motifs numériques fusionnés : un seul finditer par catégorie, le groupe
+# nommé qui a matché indiquant l'unité (les montants en "k" sont en
+# milliers d'euros, ceux en "euros" sont déjà absolus)
+_EXP_RE = re.compile(r"(?:(?P<fr>\d+)\s*ans? d[' ]exp|(?P<en>\d+)\s*years?)")
+_SALAIRE_RE = re.compile(r"(?:(?P<k>\d{2,3})\s*ke?|(?P<euros>\d+)\s*euros)")
+
+# Tokens contrat/langues fusionnés en une alternance (plus longs d'abord) :
+# une seule passe sur le texte remplace la douzaine de tests `in lowered`.
+# Pas de \b pour conserver la sémantique sous-chaîne d'origine ("stage"
+# matche dans "stagiaire").
+_CONTRAT_PRIORITE = [
+    ("CDI", {"cdi"}),
+    ("CDD", {"cdd"}),
+    ("Stage", {"stage", "intern"}),
+    ("Alternance", {"alternance", "apprentissage"}),
+    ("Freelance", {"freelance", "independant", "indep"}),
+]
+_LANGUES = [
+    ("anglais", {"anglais", "english"}),
+    ("francais", {"francais", "français", "french"}),
+    ("espagnol", {"espagnol", "spanish"}),
+    ("allemand", {"allemand", "german"}),
+]
+_SCAN_RE = re.compile("|".join(
+    re.escape(tok) for tok in sorted(
+        {t for _, toks in _CONTRAT_PRIORITE + _LANGUES for t in toks},
+        key=len,
+        reverse=True,
+    )
+))
+_LIEU_RE = re.compile(
+    r"(paris|lyon|lille|nantes|bordeaux|remote|teletravail|télétravail|idf|ile-de-france|levallois(?:-|\\s)?perret)"
+)
+
+
 
 
 def parse_job_description_text(text: str) -> Dict[str, Any]:
@@ -117,45 +165,31 @@ def parse_job_description_text(text: str) -> Dict[str, Any]:
     sections = _split_sections(cleaned)
 
     # Experience: take the minimum found
-    exp_years = _extract_numbers(lowered, [r"(\d+)\s*ans? d[' ]exp", r"(\d+)\s*years?"])
+    exp_years = [
+        int(m["fr"] or m["en"]) for m in _EXP_RE.finditer(lowered)
+    ]
     exp_min = min(exp_years) if exp_years else None
 
     # Salary: approximate if numbers are present
-    salaire_matches = _extract_numbers(lowered, [r"(\d{2,3})\s*k", r"(\d{2,3})\s*ke", r"(\d+)\s*euros"])
-    salaire_min = min(salaire_matches) * 1000 if salaire_matches else None
-    salaire_max = max(salaire_matches) * 1000 if salaire_matches else None
-
-    # Contract type
-    contrat = ""
-    if "cdi" in lowered:
-        contrat = "CDI"
-    elif "cdd" in lowered:
-        contrat = "CDD"
-    elif "stage" in lowered or "intern" in lowered:
-        contrat = "Stage"
-    elif "alternance" in lowered or "apprentissage" in lowered:
-        contrat = "Alternance"
-    elif "freelance" in lowered or "indep" in lowered or "independant" in lowered:
-        contrat = "Freelance"
+    salaires = [
+        int(m["k"]) * 1000 if m["k"] else int(m["euros"])
+        for m in _SALAIRE_RE.finditer(lowered)
+    ]
+    salaire_min = min(salaires) if salaires else None
+    salaire_max = max(salaires) if salaires else None
+
+    # Contract type + languages: one sweep over the text, then the hit-set
+    # is mapped to fields (priority order for the contract)
+    hits = set(_SCAN_RE.findall(lowered))
+    contrat = next(
+        (label for label, tokens in _CONTRAT_PRIORITE if hits & tokens), ""
+    )
+    langues = [lang for lang, tokens in _LANGUES if hits & tokens]
 
     # Location
-    m_lieu = re.search(
-        r"(paris|lyon|lille|nantes|bordeaux|remote|teletravail|télétravail|idf|ile-de-france|levallois(?:-|\\s)?perret)",
-        lowered,
-    )
+    m_lieu = _LIEU_RE.search(lowered)
     lieu = m_lieu.group(1) if m_lieu else ""
 
-    # Languages
-    langues = []
-    if "anglais" in lowered or "english" in lowered:
-        langues.append("anglais")
-    if "francais" in lowered or "français" in lowered or "french" in lowered:
-        langues.append("francais")
-    if "espagnol" in lowered or "spanish" in lowered:
-        langues.append("espagnol")
-    if "allemand" in lowered or "german" in lowered:
-        langues.append("allemand")
-
     # Job title heuristic: scan raw lines for role keywords, fallback first raw line
     titre = ""
     role_keywords = [
@@ -239,7 +273,12 @@ def list_job_files(extensions: tuple = (".txt", ".pdf")) -> List[Path]:
 
 def save_job_json(job: Dict[str, Any]) -> Path:
     out = JOBS_PARSED_DIR / f"{job['job_id']}.json"
-    out.write_text(json.dumps(job, ensure_ascii=False, indent=2), encoding="utf-8")
+    if orjson is not None:
+        out.write_bytes(orjson.dumps(job, option=orjson.OPT_INDENT_2))
+    else:
+        # Encodage incrémental, même schéma que save_candidate_json
+        with out.open("w", encoding="utf-8", buffering=1 << 16) as f:
+            json.dump(job, f, ensure_ascii=False, indent=2)
     return out
 
 
@@ -274,11 +313,13 @@ def preprocess_all_jobs() -> List[Dict[str, Any]]:
         return []
 
     print(f"[INFO] {len(files)} offre(s) trouvée(s).")
-    jobs: List[Dict[str, Any]] = []
-    for p in files:
-        job = parse_job_description_file(p)
+    # Extraction + parsing en parallèle par fichier, écritures sur le
+    # process principal (même schéma que preprocess_all_raw)
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        jobs = list(executor.map(parse_job_description_file, files, chunksize=4))
+
+    for p, job in zip(files, jobs):
         save_job_json(job)
-        jobs.append(job)
         print(f"[OK] {p.name} -> {job['job_id']}")
 
     save_jobs_csv(jobs)
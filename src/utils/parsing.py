@@ -29,68 +29,91 @@ def _normalize(text: str) -> str:
     return text.lower()
 
 
+# Motifs compilés une fois à l'import : évite le passage par le cache
+# interne de re (lookup dict + verrou) à chaque CV parsé
+_EMAIL_RE = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
+# Quantificateur borné (≤ 15 chiffres, norme E.164) et au plus un
+# séparateur entre deux chiffres : chaque itération consomme exactement un
+# chiffre, donc pas de backtracking sur les textes denses en nombres
+_PHONE_RE = re.compile(r"\+?\d(?:[ .\-]?\d){7,14}")
+_SKILL_SPLIT_RE = re.compile(r"[;,••\-]\s*")
+
+# Table qui supprime les chiffres : `text == text.translate(...)` teste en
+# une passe C l'absence totale de chiffre
+_DIGIT_DEL = str.maketrans("", "", "0123456789")
+
+
 def _extract_email(text: str) -> str:
-    match = re.search(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}", text)
+    # Garde-fou O(N) en C : un CV anonymisé sans "@" ne paie pas le moteur regex
+    if "@" not in text:
+        return ""
+    match = _EMAIL_RE.search(text)
     return match.group(0) if match else ""
 
 
 def _extract_phone(text: str) -> str:
+    # Même garde-fou : pas un seul chiffre, pas de numéro possible
+    if text == text.translate(_DIGIT_DEL):
+        return ""
     # Très simple, à raffiner au besoin
-    match = re.search(r"(?:\+?\d[\d .-]{7,}\d)", text)
+    match = _PHONE_RE.search(text)
     return match.group(0) if match else ""
 
 
-def _inject_newlines_for_headings(text: str) -> str:
-    """
-    Insère des retours à la ligne autour des mots-clés de section
-    pour faciliter la détection des sections dans les PDF où tout est collé.
-    """
-    updated = text
-    for tokens in SECTION_TOKENS.values():
-        for token in tokens:
-            # (?i) = case-insensitive, \b = frontière de mot
-            pattern = rf"(?i)\b({re.escape(token)})\b"
-            # On met le titre sur une ligne seule
-            updated = re.sub(pattern, r"\n\1\n", updated)
-    return updated
+# Tous les titres fusionnés en une alternance compilée, triée du plus long
+# au plus court pour que "compétences techniques" l'emporte sur
+# "compétences". L'alternance n'étant faite que de littéraux, elle ne peut
+# pas backtracker : un finditer suffit pour localiser les titres par
+# offsets, sans réécrire le texte
+_ALL_HEADINGS_RE = re.compile(
+    r"(?i)\b("
+    + "|".join(
+        re.escape(tok)
+        for tok in sorted(
+            {t for tokens in SECTION_TOKENS.values() for t in tokens},
+            key=len,
+            reverse=True,
+        )
+    )
+    + r")\b"
+)
 
 
 # --- Détection de sections ---------------------------------------------------
 
 
-SECTION_PATTERNS = {
+# Les titres étant des littéraux après normalisation, la détection se fait
+# par lookup dict (préfixe de 1 ou 2 mots) — plus aucun moteur regex sur le
+# chemin chaud parcouru ligne par ligne. Les variantes singulier/pluriel
+# reprennent celles des anciens motifs ^...s?\b.
+_HEADING_VARIANTS = {
     "skills": [
-        r"^compétences?\b",
-        r"^skills?\b",
-        r"^compétences techniques\b",
-        r"^technical skills?\b",
+        "compétence", "compétences", "skill", "skills",
+        "compétences techniques", "technical skill", "technical skills",
     ],
     "experience": [
-        r"^expérience professionnelle\b",
-        r"^expériences?\b",
-        r"^experience\b",
-        r"^work experience\b",
-    ],
-    "education": [
-        r"^formation\b",
-        r"^éducation\b",
-        r"^education\b",
-        r"^studies\b",
-    ],
-    "languages": [
-        r"^langues?\b",
-        r"^languages?\b",
+        "expérience professionnelle", "expérience", "expériences",
+        "experience", "work experience",
     ],
+    "education": ["formation", "éducation", "education", "studies"],
+    "languages": ["langue", "langues", "language", "languages"],
+}
+_HEADING_LOOKUP = {
+    tok: section for section, tokens in _HEADING_VARIANTS.items() for tok in tokens
 }
 
 
 def _detect_section_name(line: str) -> str | None:
     """Retourne le nom de section ('skills', 'experience', ...) si la ligne matche."""
     norm = _normalize(line).strip(" :-•\t")
-    for section, patterns in SECTION_PATTERNS.items():
-        for pat in patterns:
-            if re.match(pat, norm):
-                return section
+    words = norm.split()
+    if not words:
+        return None
+    # Préfixe le plus long d'abord ("work experience" avant "work")
+    for key in (" ".join(words[:2]), words[0].rstrip(":;,.")):
+        section = _HEADING_LOOKUP.get(key)
+        if section is not None:
+            return section
     return None
 
 
@@ -101,34 +124,39 @@ def split_into_sections(text: str) -> Dict[str, str]:
     Retourne un dict : section_name -> texte complet de la section.
     """
 
-    # 🔹 On insère des \n autour des titres (EXPERIENCE, EDUCATION, SKILLS, LANGUAGES, ...)
-    text = _inject_newlines_for_headings(text)
-
+    # L'ancienne version réécrivait tout le texte (\n injectés autour des
+    # titres) avant de re-splitter la copie. Ici une seule passe par ligne
+    # localise les titres par offsets : les segments entre deux titres sont
+    # exactement les lignes qu'aurait produites l'injection (les PDF où
+    # tout est collé restent donc gérés), sans allocation d'un second
+    # texte complet.
     sections: Dict[str, List[str]] = {}
-    current_section: str | None = None
-
-    lines = text.splitlines()
+    current: str | None = None
+
+    def _consume(segment: str) -> None:
+        # Un segment est soit un titre à part entière (variantes au
+        # singulier en tête de ligne), soit du contenu de la section courante
+        nonlocal current
+        sec = _detect_section_name(segment)
+        if sec is not None:
+            current = sec
+            sections.setdefault(current, [])
+        elif current is not None and segment.strip():
+            sections[current].append(segment)
+
+    for line in text.splitlines():
+        pos = 0
+        for match in _ALL_HEADINGS_RE.finditer(line):
+            _consume(line[pos:match.start()])
+            current = _HEADING_LOOKUP[match.group(1).lower()]
+            sections.setdefault(current, [])
+            pos = match.end()
+        _consume(line[pos:])
 
-    for line in lines:
-        if not line.strip():
-            continue
-
-        sec_name = _detect_section_name(line)
-        if sec_name is not None:
-            current_section = sec_name
-            if current_section not in sections:
-                sections[current_section] = []
-            continue
-
-        if current_section is not None:
-            sections[current_section].append(line)
-
-    # On joint les lignes par section
-    joined: Dict[str, str] = {
+    return {
         name: "\n".join(content).strip()
         for name, content in sections.items()
     }
-    return joined
 
 
 # --- Parsing des compétences -------------------------------------------------
@@ -143,16 +171,21 @@ def parse_skills(skills_text: str) -> List[str]:
 
     # On remplace les retours à la ligne par des virgules pour uniformiser
     tmp = skills_text.replace("\n", ",")
-    raw_items = re.split(r"[;,•\u2022\-]\s*", tmp)
+    raw_items = _SKILL_SPLIT_RE.split(tmp)
     cleaned: List[str] = []
 
+    # Dédoublonnage via un set (O(k) au lieu du `not in liste` quadratique),
+    # insensible à la casse : "Python" et "python" comptent une fois
+    seen = set()
     for item in raw_items:
         it = item.strip()
         if len(it) < 2:
             continue
-        # On enlève des doublons simples
-        if it not in cleaned:
-            cleaned.append(it)
+        key = it.lower()
+        if key in seen:
+            continue
+        seen.add(key)
+        cleaned.append(it)
 
     return cleaned
 
@@ -177,6 +210,10 @@ def parse_cv_text(raw_text: str) -> Dict:
     languages_text = sections.get("languages", "")
 
     skills_list = parse_skills(skills_text)
+    # Même découpage virgules/puces/retours à la ligne que les compétences :
+    # la liste est normalisée une fois ici au lieu d'un split(",") naïf
+    # à chaque scoring
+    languages_list = parse_skills(languages_text)
 
     email = _extract_email(raw_text)
     phone = _extract_phone(raw_text)
@@ -189,4 +226,5 @@ def parse_cv_text(raw_text: str) -> Dict:
         "experience_text": experience_text,
         "education_text": education_text,
         "languages_text": languages_text,
+        "languages_list": languages_list,
     }
@@ -2,22 +2,32 @@
 import re
 from typing import List
 
+# Automate Aho-Corasick optionnel pour le scan des mots-clés d'éducation ;
+# l'alternance regex compilée sert de repli si la lib n'est pas installée
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Les deux passes (repli des blancs, retrait des caractères spéciaux)
+# fusionnées en un seul motif : les classes étant disjointes, le callback
+# mappe chaque match sur " " ou "" en une unique traversée — plus de str
+# intermédiaire de la taille du CV. \w étant Unicode (accents compris), la
+# classification reste en regex — une table str.translate ne peut pas
+# énumérer cet ensemble.
+_CLEAN_RE = re.compile(r'(\s+)|[^\w\s\.\,\;\:\!\?\-\(\)]+')
+
+
+def _clean_sub(match: re.Match) -> str:
+    return ' ' if match.group(1) else ''
+
 
 def clean_text(text: str) -> str:
     """Nettoie et normalise le texte."""
     if not text:
         return ""
-    
-    # Remplace les retours chariot multiples par des espaces
-    text = re.sub(r'\r\n|\r|\n', ' ', text)
-    
-    # Supprime les espaces multiples
-    text = re.sub(r'\s+', ' ', text)
-    
-    # Supprime les caractères spéciaux indésirables (garde lettres, chiffres, ponctuation de base)
-    text = re.sub(r'[^\w\s\.\,\;\:\!\?\-\(\)]', '', text)
-    
-    return text.strip()
+
+    return _CLEAN_RE.sub(_clean_sub, text).strip()
 
 
 def normalize_skill(skill: str) -> str:
@@ -25,63 +35,115 @@ def normalize_skill(skill: str) -> str:
     return skill.lower().strip()
 
 
-def extract_years_of_experience(text: str) -> int:
-    """Extrait le nombre d'années d'expérience depuis un texte."""
-    patterns = [
-        r'(\d+)\s*ans?\s*d[\' ]?exp',
-        r'(\d+)\s*years?\s*of\s*experience',
-        r'(\d+)\+?\s*ans?',
-        r'expérience\s*:\s*(\d+)',
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, text.lower())
-        if match:
-            try:
-                return int(match.group(1))
-            except ValueError:
-                continue
-    
-    return 0
-
-
-def extract_education_level(text: str) -> str:
-    """Extrait le niveau d'éducation depuis un texte."""
-    text_lower = text.lower()
-    
-    if any(word in text_lower for word in ['doctorat', 'phd', 'ph.d']):
-        return 'doctorat'
-    elif any(word in text_lower for word in ['master', 'm2', 'm1', 'msc', 'ms']):
-        return 'master'
-    elif any(word in text_lower for word in ['licence', 'bachelor', 'bsc', 'l3']):
-        return 'licence'
-    elif any(word in text_lower for word in ['bac', 'baccalauréat', 'high school']):
-        return 'bac'
-    
+# Les quatre motifs fusionnés en une alternance à groupes nommés : une
+# seule passe sur le texte au lieu de quatre re.search successifs. L'ordre
+# de priorité d'origine (un "N ans d'exp" l'emporte sur un simple "N ans"
+# même s'il apparaît plus loin) est conservé via _YOE_PRIORITY.
+_YOE_RE = re.compile(
+    r"(?P<exp_fr>\d+)\s*ans?\s*d[' ]?exp"
+    r"|(?P<exp_en>\d+)\s*years?\s*of\s*experience"
+    r"|(?P<ans>\d+)\+?\s*ans?"
+    r"|expérience\s*:\s*(?P<label>\d+)"
+)
+_YOE_PRIORITY = ("exp_fr", "exp_en", "ans", "label")
+
+
+def extract_years_of_experience(text: str, text_lower: str = None) -> int:
+    """Extrait le nombre d'années d'expérience depuis un texte.
+
+    `text_lower` permet de passer une version déjà minusculisée : les
+    appelants qui enchaînent plusieurs extractions sur le même texte
+    évitent ainsi une allocation O(N) par appel.
+    """
+    if text_lower is None:
+        text_lower = text.lower()
+    best_rank = len(_YOE_PRIORITY)
+    value = 0
+    for match in _YOE_RE.finditer(text_lower):
+        rank = _YOE_PRIORITY.index(match.lastgroup)
+        if rank < best_rank:
+            best_rank = rank
+            value = int(match.group(match.lastgroup))
+            if rank == 0:
+                break
+    return value
+
+
+# Mots-clés fusionnés en une alternance à groupes nommés : une seule passe
+# sur le texte au lieu de jusqu'à 16 tests `in`. Pas de \b pour conserver la
+# sémantique sous-chaîne d'origine ("ms" matche dans "ms office"), et les
+# tokens les plus longs en tête de chaque groupe ("ph.d" avant "phd").
+_EDU_KEYWORDS = {
+    'doctorat': ['doctorat', 'ph.d', 'phd'],
+    'master': ['master', 'msc', 'm1', 'm2', 'ms'],
+    'licence': ['licence', 'bachelor', 'bsc', 'l3'],
+    'bac': ['baccalauréat', 'high school', 'bac'],
+}
+_EDU_RE = re.compile("|".join(
+    f"(?P<{level}>" + "|".join(re.escape(t) for t in terms) + ")"
+    for level, terms in _EDU_KEYWORDS.items()
+))
+_EDU_PRIORITY = ('doctorat', 'master', 'licence', 'bac')
+
+_EDU_AC = None
+if ahocorasick is not None:
+    _EDU_AC = ahocorasick.Automaton()
+    for _level, _terms in _EDU_KEYWORDS.items():
+        for _term in _terms:
+            _EDU_AC.add_word(_term, _level)
+    _EDU_AC.make_automaton()
+
+
+def extract_education_level(text: str, text_lower: str = None) -> str:
+    """Extrait le niveau d'éducation depuis un texte.
+
+    Accepte comme extract_years_of_experience une version déjà
+    minusculisée via `text_lower`.
+    """
+    if text_lower is None:
+        text_lower = text.lower()
+    if _EDU_AC is not None:
+        hits = {level for _, level in _EDU_AC.iter(text_lower)}
+    else:
+        hits = {match.lastgroup for match in _EDU_RE.finditer(text_lower)}
+    for level in _EDU_PRIORITY:
+        if level in hits:
+            return level
     return 'unknown'
 
 
+# Les tokens étant définis par \w+, le passage par clean_text était du
+# travail perdu : findall extrait directement les mots sans les deux
+# allocations intermédiaires (texte nettoyé + texte minusculisé nettoyé)
+_TOKEN_RE = re.compile(r'\w+')
+
+
 def tokenize_text(text: str) -> List[str]:
     """Tokenise un texte en mots."""
-    cleaned = clean_text(text)
-    tokens = re.findall(r'\b\w+\b', cleaned.lower())
-    return tokens
+    if not text:
+        return []
+    return _TOKEN_RE.findall(text.lower())
+
+
+# Ensemble construit une fois à l'import (et dédoublonné : plusieurs
+# entrées apparaissaient 2-3 fois dans l'ancien littéral) : plus de
+# reconstruction d'un set de ~50 chaînes à chaque appel, et le frozenset
+# est à l'abri des mutations accidentelles
+_DEFAULT_STOPWORDS = frozenset({
+    'le', 'de', 'et', 'à', 'un', 'il', 'être', 'en', 'avoir', 'que',
+    'pour', 'dans', 'ce', 'son', 'une', 'sur', 'avec', 'ne', 'se', 'pas',
+    'tout', 'plus', 'par', 'grand', 'aux', 'des', 'les', 'du', 'la',
+    'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
+    'of', 'with', 'by', 'from', 'as', 'is', 'was', 'are', 'were', 'been',
+    'be', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would',
+})
 
 
 def remove_stopwords(tokens: List[str], custom_stopwords: List[str] = None) -> List[str]:
     """Supprime les mots vides."""
-    default_stopwords = {
-        'le', 'de', 'et', 'à', 'un', 'il', 'être', 'et', 'en', 'avoir', 'que',
-        'pour', 'dans', 'ce', 'son', 'une', 'sur', 'avec', 'ne', 'se', 'pas',
-        'tout', 'plus', 'par', 'grand', 'en', 'une', 'ce', 'aux', 'de', 'des',
-        'les', 'du', 'la', 'le', 'et', 'à', 'un', 'il', 'être', 'et', 'en',
-        'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
-        'of', 'with', 'by', 'from', 'as', 'is', 'was', 'are', 'were', 'been',
-        'be', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would',
-    }
-    
-    stopwords = default_stopwords
-    if custom_stopwords:
-        stopwords.update(custom_stopwords)
-    
+    stopwords = (
+        _DEFAULT_STOPWORDS | set(custom_stopwords)
+        if custom_stopwords else _DEFAULT_STOPWORDS
+    )
+
     return [token for token in tokens if token not in stopwords]
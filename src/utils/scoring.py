@@ -1,7 +1,71 @@
 """Calcul des scores multi-critères (profil, technique, soft skills)."""
+from functools import lru_cache
 from typing import Dict, List, Set
 import re
 
+import numpy as np
+
+# Automate Aho-Corasick (temps linéaire quel que soit le nombre de termes)
+# si la lib est installée ; sinon les alternances regex compilées suffisent
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+
+def _normalize_skills(skills: List[str]) -> frozenset:
+    """Normalise une liste de compétences en frozenset (lowercase + strip).
+
+    Les frozensets déjà normalisés passent tels quels : les appelants qui
+    scorent des lots de candidats peuvent ainsi normaliser une seule fois
+    (côté job comme côté candidat) et réutiliser le même set partout.
+    """
+    if isinstance(skills, frozenset):
+        return skills
+    return frozenset(s.lower().strip() for s in skills)
+
+
+def prepare_job_skills(job_profile: Dict) -> tuple:
+    """Pré-normalise les compétences d'une offre, une fois par batch.
+
+    Returns:
+        (required_set, optional_set) : frozensets prêts à passer aux
+        fonctions de scoring pour chaque candidat du lot.
+    """
+    return (
+        _normalize_skills(job_profile.get("skills_obligatoires", [])),
+        _normalize_skills(job_profile.get("skills_optionnelles", [])),
+    )
+
+
+def _skill_match(
+    candidate_set: frozenset,
+    required_set: frozenset,
+    optional_set: frozenset
+) -> float:
+    """Cœur du matching de compétences sur des sets déjà normalisés."""
+    if not required_set:
+        return 50.0  # Si aucune compétence requise, score neutre
+
+    # Sortie anticipée : un isdisjoint (boucle C qui s'arrête au premier
+    # commun) évite de matérialiser des intersections vides pour les
+    # candidats hors sujet, cas majoritaire sur un gros lot
+    if candidate_set.isdisjoint(required_set) and (
+        not optional_set or candidate_set.isdisjoint(optional_set)
+    ):
+        return 0.0
+
+    # Score pour compétences obligatoires (70% du score)
+    matched_required = len(candidate_set & required_set)
+    required_score = (matched_required / len(required_set)) * 70
+
+    # Score pour compétences optionnelles (30% du score)
+    matched_optional = len(candidate_set & optional_set)
+    optional_score = (matched_optional / len(optional_set)) * 30 if optional_set else 0
+
+    total_score = required_score + optional_score
+    return min(100.0, max(0.0, total_score))
+
 
 def calculate_skill_match_score(
     candidate_skills: List[str],
@@ -10,35 +74,71 @@ def calculate_skill_match_score(
 ) -> float:
     """
     Calcule un score de matching des compétences (0-100).
-    
+
     Args:
         candidate_skills: Liste des compétences du candidat
         required_skills: Compétences obligatoires
         optional_skills: Compétences optionnelles
-    
+
     Returns:
         Score entre 0 et 100
     """
-    optional_skills = optional_skills or []
-    
-    # Normalisation
-    candidate_set = {s.lower().strip() for s in candidate_skills}
-    required_set = {s.lower().strip() for s in required_skills}
-    optional_set = {s.lower().strip() for s in optional_skills}
-    
+    # Côté offre d'abord : si rien n'est requis, inutile de normaliser
+    # les compétences du candidat
+    required_set = _normalize_skills(required_skills)
     if not required_set:
-        return 50.0  # Si aucune compétence requise, score neutre
-    
-    # Score pour compétences obligatoires (70% du score)
-    matched_required = len(candidate_set & required_set)
-    required_score = (matched_required / len(required_set)) * 70 if required_set else 0
-    
-    # Score pour compétences optionnelles (30% du score)
-    matched_optional = len(candidate_set & optional_set)
-    optional_score = (matched_optional / len(optional_set)) * 30 if optional_set else 0
-    
-    total_score = required_score + optional_score
-    return min(100.0, max(0.0, total_score))
+        return 50.0
+
+    return _skill_match(
+        _normalize_skills(candidate_skills),
+        required_set,
+        _normalize_skills(optional_skills or []),
+    )
+
+
+def score_candidates_batch(
+    candidates: List[Dict],
+    job_profile: Dict
+) -> np.ndarray:
+    """
+    Score de compétences pour un lot de candidats contre une offre (0-100).
+
+    Construit une matrice de présence (N candidats × V compétences de
+    l'offre) en uint8 et calcule les comptages de matchs par deux produits
+    matriciels NumPy, au lieu de N paires d'intersections de sets Python.
+    Le vocabulaire se limite aux compétences de l'offre : une compétence
+    candidat hors offre ne contribue à aucun score.
+
+    Returns:
+        Tableau float32 (N,) — mêmes valeurs que calculate_skill_match_score
+        candidat par candidat.
+    """
+    n = len(candidates)
+    if n == 0:
+        return np.empty(0, dtype=np.float32)
+
+    required_set, optional_set = prepare_job_skills(job_profile)
+    if not required_set:
+        return np.full(n, 50.0, dtype=np.float32)
+
+    vocab = {skill: i for i, skill in enumerate(required_set | optional_set)}
+    presence = np.zeros((n, len(vocab)), dtype=np.uint8)
+    for row, candidate in enumerate(candidates):
+        for skill in _normalize_skills(candidate.get("skills_list", [])):
+            col = vocab.get(skill)
+            if col is not None:
+                presence[row, col] = 1
+
+    req_mask = np.zeros(len(vocab), dtype=np.uint8)
+    req_mask[[vocab[s] for s in required_set]] = 1
+    scores = (presence @ req_mask).astype(np.float32) * (70.0 / len(required_set))
+
+    if optional_set:
+        opt_mask = np.zeros(len(vocab), dtype=np.uint8)
+        opt_mask[[vocab[s] for s in optional_set]] = 1
+        scores += (presence @ opt_mask).astype(np.float32) * (30.0 / len(optional_set))
+
+    return np.clip(scores, 0.0, 100.0)
 
 
 def calculate_experience_score(
@@ -82,12 +182,19 @@ def calculate_language_match_score(
     """
     if not required_languages:
         return 100.0
-    
-    candidate_set = {lang.lower().strip() for lang in candidate_languages}
+
     required_set = {lang.lower().strip() for lang in required_languages}
-    
+    if not required_set:
+        return 0.0
+
+    # Le set candidat n'est construit que si l'offre exige des langues,
+    # et un isdisjoint court-circuite l'intersection complète
+    candidate_set = {lang.lower().strip() for lang in candidate_languages}
+    if candidate_set.isdisjoint(required_set):
+        return 0.0
+
     matched = len(candidate_set & required_set)
-    return (matched / len(required_set)) * 100 if required_set else 0.0
+    return (matched / len(required_set)) * 100
 
 
 def calculate_profile_score(
@@ -102,14 +209,12 @@ def calculate_profile_score(
     - Expérience (30%)
     - Langues (20%)
     """
-    # Compétences
-    candidate_skills = candidate.get("skills_list", [])
-    required_skills = job_profile.get("skills_obligatoires", [])
-    optional_skills = job_profile.get("skills_optionnelles", [])
-    
-    skill_score = calculate_skill_match_score(
-        candidate_skills, required_skills, optional_skills
-    )
+    # Compétences : une seule normalisation par candidat et par offre
+    # (les frozensets passent tels quels dans _normalize_skills)
+    candidate_set = _normalize_skills(candidate.get("skills_list", []))
+    required_set, optional_set = prepare_job_skills(job_profile)
+
+    skill_score = _skill_match(candidate_set, required_set, optional_set)
     
     # Expérience
     candidate_exp = candidate.get("years_experience", 0)
@@ -120,8 +225,13 @@ def calculate_profile_score(
         candidate_exp, required_exp_min, required_exp_max
     )
     
-    # Langues
-    candidate_langs = candidate.get("languages_text", "").split(",") if candidate.get("languages_text") else []
+    # Langues : liste structurée produite au parsing (gère ; puces et
+    # retours à la ligne) ; repli sur le split(",") historique pour les
+    # JSON générés avant l'ajout du champ
+    candidate_langs = candidate.get("languages_list")
+    if candidate_langs is None:
+        languages_text = candidate.get("languages_text", "")
+        candidate_langs = languages_text.split(",") if languages_text else []
     required_langs = job_profile.get("langues", [])
     
     lang_score = calculate_language_match_score(candidate_langs, required_langs)
@@ -150,6 +260,50 @@ def calculate_technical_score(
     )
 
 
+# Soft skills communs, fusionnés en une alternance à groupes nommés
+# compilée à l'import : une seule passe sur le texte remplace ~30 scans
+# `in` de la lettre complète. Pas de \b pour garder la sémantique
+# sous-chaîne d'origine ("lead" matche dans "leadership"), et les termes
+# les plus longs d'abord dans chaque groupe.
+_SOFT_SKILLS_KEYWORDS = {
+    'teamwork': ['équipe', 'collaboration', 'teamwork', 'collaborer'],
+    'communication': ['communication', 'communiquer', 'présenter', 'expliquer'],
+    'leadership': ['lead', 'leader', 'diriger', 'management', 'gérer'],
+    'autonomy': ['autonome', 'autonomie', 'indépendant', 'indépendance'],
+    'problem_solving': ['résoudre', 'solution', 'problème', 'challenge'],
+    'adaptability': ['adaptable', 'flexible', 'changement', 'évolution'],
+    'motivation': ['motivé', 'motivation', 'passion', 'intéressé', 'enthousiaste'],
+}
+_SOFT_RE = re.compile("|".join(
+    f"(?P<{skill_type}>"
+    + "|".join(re.escape(t) for t in sorted(terms, key=len, reverse=True))
+    + ")"
+    for skill_type, terms in _SOFT_SKILLS_KEYWORDS.items()
+))
+
+_SOFT_AC = None
+if ahocorasick is not None:
+    _SOFT_AC = ahocorasick.Automaton()
+    for _skill_type, _terms in _SOFT_SKILLS_KEYWORDS.items():
+        for _term in _terms:
+            _SOFT_AC.add_word(_term, _skill_type)
+    _SOFT_AC.make_automaton()
+
+
+@lru_cache(maxsize=128)
+def _compile_keyword_alt(keywords: tuple) -> re.Pattern:
+    """Compile une alternance pour un tuple de mots-clés recruteur.
+
+    Le cache est indexé par le tuple trié : quand la même liste est
+    réutilisée sur tout un lot de candidats, la compilation n'a lieu
+    qu'une fois et chaque lettre n'est parcourue qu'une seule fois au
+    lieu d'un scan `in` par mot-clé.
+    """
+    return re.compile("|".join(
+        re.escape(kw) for kw in sorted(keywords, key=len, reverse=True)
+    ))
+
+
 def calculate_soft_skills_score(
     motivation_text: str,
     experience_text: str = "",
@@ -157,46 +311,38 @@ def calculate_soft_skills_score(
 ) -> float:
     """
     Calcule un score basé sur les soft skills détectés dans le texte (0-100).
-    
+
     Analyse:
     - Mots-clés de soft skills dans la lettre de motivation
     - Ton et structure du texte
     - Indicateurs de motivation
     """
     keywords = keywords or []
-    
+
     if not motivation_text:
         return 50.0  # Score neutre si pas de lettre
-    
+
     text_lower = (motivation_text + " " + experience_text).lower()
-    
-    # Soft skills communs
-    soft_skills_keywords = {
-        'teamwork': ['équipe', 'collaboration', 'teamwork', 'collaborer'],
-        'communication': ['communication', 'communiquer', 'présenter', 'expliquer'],
-        'leadership': ['lead', 'leader', 'diriger', 'management', 'gérer'],
-        'autonomy': ['autonome', 'autonomie', 'indépendant', 'indépendance'],
-        'problem_solving': ['résoudre', 'solution', 'problème', 'challenge'],
-        'adaptability': ['adaptable', 'flexible', 'changement', 'évolution'],
-        'motivation': ['motivé', 'motivation', 'passion', 'intéressé', 'enthousiaste'],
-    }
-    
-    # Compter les occurrences
-    detected_skills = set()
-    for skill_type, terms in soft_skills_keywords.items():
-        for term in terms:
-            if term in text_lower:
-                detected_skills.add(skill_type)
-                break
-    
+
+    # Une passe : l'automate (ou le groupe nommé de l'alternance) donne
+    # directement la catégorie détectée
+    if _SOFT_AC is not None:
+        detected_skills = {cat for _, cat in _SOFT_AC.iter(text_lower)}
+    else:
+        detected_skills = {m.lastgroup for m in _SOFT_RE.finditer(text_lower)}
+
     # Score de base basé sur le nombre de soft skills détectés
-    base_score = (len(detected_skills) / len(soft_skills_keywords)) * 60
+    base_score = (len(detected_skills) / len(_SOFT_SKILLS_KEYWORDS)) * 60
     
-    # Bonus pour mots-clés spécifiques du recruteur
+    # Bonus pour mots-clés spécifiques du recruteur : alternance compilée
+    # mémoïsée (les doublons insensibles à la casse comptent désormais pour
+    # un seul mot-clé, numérateur comme dénominateur)
     keyword_bonus = 0
     if keywords:
-        matched_keywords = sum(1 for kw in keywords if kw.lower() in text_lower)
-        keyword_bonus = (matched_keywords / len(keywords)) * 40 if keywords else 0
+        distinct = tuple(sorted({kw.lower() for kw in keywords}))
+        pattern = _compile_keyword_alt(distinct)
+        matched_keywords = len({m.group(0) for m in pattern.finditer(text_lower)})
+        keyword_bonus = (matched_keywords / len(distinct)) * 40
     
     # Bonus pour longueur et structure (indicateur d'effort)
     length_bonus = min(10, len(motivation_text.split()) / 50)
@@ -0,0 +1,64 @@
+"""Noyaux de scoring batch compilés avec Numba (optionnel).
+
+Si Numba est installé, les noyaux sont JIT-compilés (cache=True : le coût
+LLVM n'est payé qu'une fois par machine). Sinon, un repli NumPy vectorisé
+équivalent est exposé sous le même nom — aucun appelant n'a à s'en soucier.
+"""
+import numpy as np
+
+try:
+    from numba import njit, prange  # type: ignore
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+
+    @njit(cache=True, fastmath=True)
+    def weighted_global_scores(scores: np.ndarray, weights: np.ndarray) -> np.ndarray:
+        """Scores globaux pondérés depuis une matrice (N, 3) profil/tech/soft."""
+        n = scores.shape[0]
+        out = np.empty(n, dtype=np.float32)
+        for i in range(n):
+            acc = 0.0
+            for j in range(weights.size):
+                acc += scores[i, j] * weights[j]
+            out[i] = acc
+        return out
+
+    @njit(cache=True, parallel=True)
+    def technical_scores_from_presence(presence: np.ndarray) -> np.ndarray:
+        """Scores techniques (0-100) depuis une matrice de présence (N, R)."""
+        n, r = presence.shape
+        scores = np.empty(n, dtype=np.float64)
+        if r == 0:
+            for i in prange(n):
+                scores[i] = 50.0
+            return scores
+        for i in prange(n):
+            matched = 0
+            for j in range(r):
+                if presence[i, j]:
+                    matched += 1
+            scores[i] = (matched / r) * 70.0
+        return scores
+
+else:
+
+    def weighted_global_scores(scores: np.ndarray, weights: np.ndarray) -> np.ndarray:
+        """Scores globaux pondérés depuis une matrice (N, 3) profil/tech/soft.
+
+        Repli NumPy quand Numba n'est pas installé.
+        """
+        return scores @ weights
+
+    def technical_scores_from_presence(presence: np.ndarray) -> np.ndarray:
+        """Scores techniques (0-100) depuis une matrice de présence (N, R).
+
+        Repli NumPy quand Numba n'est pas installé.
+        """
+        n, r = presence.shape
+        if r == 0:
+            return np.full(n, 50.0)
+        return presence.sum(axis=1) / r * 70.0